@@ -0,0 +1,304 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import Union, List, Tuple, Iterator, Optional
+
+import numpy as np
+from graphviz import Graph
+
+from data_structures.disjoint_set_union import DisjointSetUnion
+from utils.draw_utils import draw_graph, draw_disjoint_sets
+from utils.graph_utils import ParsedGraph, CSRGraph, as_parsed_graph
+from utils.shared_memory_utils import (
+    SharedArraysLayout,
+    create_shared_arrays,
+    shared_arrays,
+    attach_shared_memory,
+    release_shared_memory,
+)
+
+"""
+Minimum number of edges for which the cheapest edges are searched by a pool of processes
+"""
+BORUVKA_PARALLEL_MIN_EDGES = 1 << 18
+
+"""
+Edges and components shared by the parent process, attached once by every worker of boruvka_steps
+"""
+__worker_memory = None
+__worker_arrays = None
+
+
+def boruvka_algorithm(input_graph: Union[str, ParsedGraph, CSRGraph]) -> Iterator[Union[str, Graph]]:
+    """
+    Borůvka's algorithm for finding the minimum spanning tree of a graph
+    :param input_graph: string representation of the graph, the graph already parsed or a CSR graph
+    :return: A list with the elements to render in the frontend that represent the resolution of the algorithm.
+    """
+    graph = as_parsed_graph(input_graph, directed=False, weighted=True)
+
+    edge_list = graph.edges
+
+    yield "## Borůvka's algorithm resolution"
+    yield "The initial graph is the following:"
+    yield draw_graph(len(graph), edge_list, weighted=True, directed=False)
+
+    dsu = DisjointSetUnion(len(graph))
+    yield "At the start every node is a component on its own, the initial Disjoint Set Union is the following:"
+    yield draw_disjoint_sets(dsu)
+
+    edges_selected = set()
+    total_weight = 0
+
+    for round_number, (cheapest_edges, added_edges) in enumerate(boruvka_steps(graph, dsu, max_workers=1), 1):
+        yield f"### Round {round_number}\n"
+        yield "The cheapest edge leaving every component is the following:"
+        yield " | ".join([f"{component}: ({u}, {v}) with weight {weight}"
+                          for component, (u, v, weight) in cheapest_edges])
+
+        for u, v, weight in added_edges:
+            edges_selected.add((u, v))
+            total_weight += weight
+            yield f"The edge ({u}, {v}) is added to the MST"
+
+        yield f"There are {dsu.components} components left and the total weight of the MST is {total_weight}"
+        yield draw_graph(len(graph), edge_list, weighted=True, directed=False, edges_selected=edges_selected)
+        yield "The current state of the Disjoint Set Union is the following:"
+        yield draw_disjoint_sets(dsu)
+
+    yield "### Final result\n"
+    yield "The final graph is the following:"
+    yield draw_graph(len(graph), edge_list, weighted=True, directed=False, edges_selected=edges_selected)
+    yield f"The total weight of the MST is {total_weight}"
+
+
+def boruvka_solve(input_graph: Union[str, ParsedGraph, CSRGraph],
+                  max_workers: Optional[int] = None) -> Tuple[List[Tuple[int, int, float]], float]:
+    """
+    Borůvka's algorithm without the resolution.
+    :param input_graph: string representation of the graph, the graph already parsed or a CSR graph
+    :param max_workers: The number of processes, by default the number of CPUs.
+    :return: The edges of the minimum spanning tree (or forest) and its total weight.
+    """
+    graph = as_parsed_graph(input_graph, directed=False, weighted=True)
+    dsu = DisjointSetUnion(len(graph))
+
+    mst_edges = [edge for _, added_edges in boruvka_steps(graph, dsu, max_workers) for edge in added_edges]
+
+    return mst_edges, sum(weight for _, _, weight in mst_edges)
+
+
+def boruvka_steps(graph: ParsedGraph,
+                  dsu: DisjointSetUnion,
+                  max_workers: Optional[int] = None) \
+        -> Iterator[Tuple[List[Tuple[int, Tuple[int, int, float]]], List[Tuple[int, int, float]]]]:
+    """
+    Rounds of Borůvka's algorithm. In every round the cheapest edge leaving every component is found, all of them
+    are added to the tree at once and the components are contracted through the disjoint set union, so there are
+    at most log2(n) rounds. The ties between edges of the same weight are broken by their index in the edge list,
+    which keeps the chosen edges from closing a cycle.
+    The search of the cheapest edges is vectorized and, with enough edges, the edge list is split among a pool of
+    processes that read the edges and the component of every node from shared memory.
+    :param graph: The graph.
+    :param dsu: The disjoint set union of the components, updated in place.
+    :param max_workers: The number of processes, by default the number of CPUs. With one, no pool is used.
+    :return: For every round, the cheapest edge of every component and the edges added to the tree.
+    """
+    n = len(graph)
+    m = len(graph.edges)
+    max_workers = max_workers or os.cpu_count() or 1
+
+    if max_workers == 1 or m < BORUVKA_PARALLEL_MIN_EDGES:
+        arrays = {
+            "sources": np.empty(m, dtype=np.intc),
+            "targets": np.empty(m, dtype=np.intc),
+            "weights": np.empty(m, dtype=np.float64),
+            "components": np.arange(n, dtype=np.intc),
+        }
+        __copy_edges(graph, arrays)
+
+        yield from __boruvka_rounds(arrays, dsu, lambda: [__cheapest_edges(arrays, 0, m)])
+        return
+
+    memory, layout = create_shared_arrays({
+        "sources": ("i", m), "targets": ("i", m), "weights": ("d", m), "components": ("i", n)
+    })
+
+    try:
+        arrays = __numpy_arrays(shared_arrays(memory, layout))
+        __copy_edges(graph, arrays)
+        arrays["components"][:] = np.arange(n)
+
+        chunk_size = (m + max_workers - 1) // max_workers
+        tasks = [(start, min(start + chunk_size, m)) for start in range(0, m, chunk_size)]
+
+        with ProcessPoolExecutor(
+                max_workers, initializer=__attach_edges, initargs=(memory.name, layout)
+        ) as executor:
+            yield from __boruvka_rounds(arrays, dsu, lambda: list(executor.map(__cheapest_shared_edges, tasks)))
+
+    finally:
+        # The views over the block are dropped before closing it, also when the generator is closed early
+        arrays = None
+        release_shared_memory(memory)
+
+
+def __boruvka_rounds(arrays: dict, dsu: DisjointSetUnion, search) \
+        -> Iterator[Tuple[List[Tuple[int, Tuple[int, int, float]]], List[Tuple[int, int, float]]]]:
+    """
+    Runs the rounds of Borůvka's algorithm until no edge leaves any component.
+    :param arrays: The edges and the component of every node.
+    :param dsu: The disjoint set union of the components, updated in place.
+    :param search: Function that returns the cheapest edge of every component for every part of the edge list.
+    :return: For every round, the cheapest edge of every component and the edges added to the tree.
+    """
+    weights, components = arrays["weights"], arrays["components"]
+    n = len(components)
+
+    while True:
+        # Every part gives a candidate edge per component, so the cheapest of them is taken
+        candidates = search()
+        cheapest_components, cheapest_indices = __cheapest_per_component(
+            np.concatenate([part_components for part_components, _ in candidates]),
+            np.concatenate([part_indices for _, part_indices in candidates]),
+            weights,
+            n
+        )
+
+        if len(cheapest_indices) == 0:
+            return
+
+        cheapest_edges = list(zip(cheapest_components.tolist(), __edges_at(arrays, cheapest_indices)))
+        added_edges = []
+
+        # Two components may choose the same edge, so every edge is added once
+        for u, v, weight in __edges_at(arrays, np.unique(cheapest_indices)):
+            if dsu.union(u, v):
+                added_edges.append((u, v, weight))
+
+        # Every node is labelled with the representative of its component, so only the representatives that may
+        # have been merged need to be found again to contract the components
+        representatives = np.arange(n, dtype=np.intc)
+        representatives[cheapest_components] = dsu.find_many(cheapest_components.tolist())
+        components[:] = representatives[components]
+
+        yield cheapest_edges, added_edges
+
+
+def __edges_at(arrays: dict, indices: np.ndarray) -> List[Tuple[int, int, float]]:
+    """
+    Returns the edges at the given indices of the edge list.
+    :param arrays: The edges and the component of every node.
+    :param indices: The indices of the edges.
+    :return: The edges (u, v, weight).
+    """
+    return list(zip(*(arrays[name][indices].tolist() for name in ("sources", "targets", "weights"))))
+
+
+def __cheapest_per_component(edge_components: np.ndarray,
+                             edge_indices: np.ndarray,
+                             weights: np.ndarray,
+                             n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Finds the cheapest edge of every component in linear time, breaking the ties by the index of the edge:
+    first the minimum weight of every component is found and then the minimum index among its edges with that weight.
+    :param edge_components: The component of every candidate edge.
+    :param edge_indices: The index of every candidate edge in the edge list.
+    :param weights: The weights of all the edges.
+    :param n: The number of nodes.
+    :return: The components and the index of their cheapest edge.
+    """
+    edge_weights = weights[edge_indices]
+
+    cheapest_weights = np.full(n, np.inf)
+    np.minimum.at(cheapest_weights, edge_components, edge_weights)
+
+    cheapest = edge_weights == cheapest_weights[edge_components]
+    cheapest_indices = np.full(n, np.iinfo(np.intp).max)
+    np.minimum.at(cheapest_indices, edge_components[cheapest], edge_indices[cheapest])
+
+    components = np.flatnonzero(cheapest_indices != np.iinfo(np.intp).max)
+
+    return components, cheapest_indices[components]
+
+
+def __cheapest_edges(arrays: dict, start: int, end: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Finds the cheapest edge leaving every component among the edges from start to end.
+    :param arrays: The edges and the component of every node.
+    :param start: The first edge.
+    :param end: The end of the edges, not included.
+    :return: The components and the index of their cheapest edge.
+    """
+    components = arrays["components"]
+    source_components = components[arrays["sources"][start:end]]
+    target_components = components[arrays["targets"][start:end]]
+
+    leaving = np.flatnonzero(source_components != target_components)
+    edge_indices = leaving + start
+
+    # Every edge leaving a component is a candidate for the components of both of its endpoints
+    return __cheapest_per_component(
+        np.concatenate((source_components[leaving], target_components[leaving])),
+        np.concatenate((edge_indices, edge_indices)),
+        arrays["weights"],
+        len(components)
+    )
+
+
+def __copy_edges(graph: ParsedGraph, arrays: dict):
+    """
+    Copies the edges of the graph to the shared arrays. The arrays of a CSR graph are copied directly,
+    keeping every undirected edge once.
+    :param graph: The graph.
+    :param arrays: The shared arrays.
+    """
+    if isinstance(graph.adjacency, CSRGraph):
+        csr = graph.adjacency
+        offsets = np.frombuffer(memoryview(csr.offsets), dtype=np.intc)
+        sources = np.repeat(np.arange(csr.n, dtype=np.intc), np.diff(offsets))
+        targets = np.frombuffer(memoryview(csr.targets), dtype=np.intc)
+        weights = np.frombuffer(memoryview(csr.weights), dtype=np.float64)
+        edges = sources < targets if not csr.directed else slice(None)
+
+        arrays["sources"][:] = sources[edges]
+        arrays["targets"][:] = targets[edges]
+        arrays["weights"][:] = weights[edges]
+        return
+
+    edges = np.fromiter(chain.from_iterable(graph.edges), dtype=np.float64, count=3 * len(graph.edges))
+    edges = edges.reshape(-1, 3)
+    arrays["sources"][:] = edges[:, 0]
+    arrays["targets"][:] = edges[:, 1]
+    arrays["weights"][:] = edges[:, 2]
+
+
+def __numpy_arrays(views: dict) -> dict:
+    """
+    Wraps the views over the shared arrays as NumPy arrays, without copying them.
+    :param views: The views over the shared arrays by name.
+    :return: The NumPy arrays by name.
+    """
+    return {name: np.frombuffer(view, dtype=np.intc if view.format == "i" else np.float64)
+            for name, view in views.items()}
+
+
+def __attach_edges(name: str, layout: SharedArraysLayout):
+    """
+    Initializer of the workers of boruvka_steps, attaches to the edges and the components in shared memory.
+    :param name: The name of the shared memory block.
+    :param layout: The layout of the arrays inside the block.
+    """
+    global __worker_memory, __worker_arrays
+
+    __worker_memory = attach_shared_memory(name)
+    __worker_arrays = __numpy_arrays(shared_arrays(__worker_memory, layout))
+
+
+def __cheapest_shared_edges(task: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Task of the workers of boruvka_steps, finds the cheapest edge of every component in a part of the edge list.
+    :param task: The first edge and the end of the part.
+    :return: The components and the index of their cheapest edge.
+    """
+    return __cheapest_edges(__worker_arrays, *task)
@@ -1,61 +1,101 @@
-from queue import PriorityQueue
-from typing import Union, List, Tuple, Set
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from heapq import heappush, heappop
+from math import inf
+from typing import Union, Tuple, Set, Optional, List, Iterator, MutableSequence, Iterable, Sequence, Dict, Callable
 
 from graphviz import Graph
 
 from utils.draw_utils import draw_graph
-from utils.graph_utils import input_to_adjacency_list, adjacency_list_to_list_of_edges
+from data_structures.binary_heap import BinaryHeap
+from data_structures.bucket_queue import BucketQueue, BUCKET_QUEUE_MAX_WEIGHT
+from data_structures.radix_heap import RadixHeap
+from utils.cache_utils import LRUCache, shortest_path_cache
+from utils.graph_utils import (
+    ParsedGraph,
+    CSRGraph,
+    as_parsed_graph,
+    as_csr_graph,
+    reverse_graph,
+    max_integer_weight,
+    graph_fingerprint,
+)
 from utils.markdown_utils import latex_to_markdown, matrix_to_markdown
+from utils.shared_memory_utils import (
+    SharedArraysLayout,
+    share_arrays,
+    shared_arrays,
+    attach_shared_memory,
+    release_shared_memory,
+)
 
+"""
+Graph shared by the parent process, attached once by every worker of dijkstra_batch
+"""
+__worker_memory = None
+__worker_graph = None
+__worker_new_queue = None
 
-def dijkstra(input_graph: str) -> Union[str, Graph]:
-    input_graph = input_graph.splitlines()
-    u = int(input_graph[-1])
-    input_graph = input_graph[:-1]
-    input_graph = "\n".join(input_graph)
 
-    graph: List[List[Tuple[int, float]]] = input_to_adjacency_list(input_graph, directed=False, weighted=True)
+def dijkstra(input_graph: Union[str, ParsedGraph, CSRGraph],
+             source: Optional[int] = None,
+             target: Optional[int] = None) -> Union[str, Graph]:
+    """
+    Dijkstra's algorithm for finding the shortest paths from a source vertex to all the other vertices.
+    The source is taken from the input unless it is given. A CSR graph does not define one, so a ValueError
+    is raised if it is not given.
+    :param input_graph: The string representation of the graph, the graph already parsed or a CSR graph.
+    :param source: The source vertex, by default the one defined by the input.
+    :param target: The target vertex, by default the one defined by the input, if any.
+    :return: A list with the elements to render in the frontend that represent the resolution of the algorithm.
+    """
+    graph = as_parsed_graph(input_graph, directed=False, weighted=True, source_vertex=True)
+    u = graph.source if source is None else source
+    target = graph.target if target is None else target
 
-    edge_list = adjacency_list_to_list_of_edges(graph)
+    if u is None:
+        raise ValueError("The graph does not define a source vertex, so it must be given")
+
+    edge_list = graph.edges
 
     yield "## Dijkstra's algorithm resolution"
     yield "The initial graph is the following:"
     yield draw_graph(len(graph), edge_list, weighted=True, directed=False)
-    yield f"The source vertex is {u}. From this vertex, we will calculate the shortest path to all other vertices."
+    if target is None:
+        yield f"The source vertex is {u}. From this vertex, we will calculate the shortest path to all other vertices."
+    else:
+        yield f"The source vertex is {u} and the target vertex is {target}. " \
+              f"We will stop as soon as the shortest path to the target is known."
+
+    distances = array("d", [inf]) * len(graph)
+    previous_nodes = array("i", [-1]) * len(graph)
+
+    steps = dijkstra_steps(graph, u, distances, previous_nodes, record=True, target=target)
 
-    queue = PriorityQueue()
-    distances = [float('inf')] * len(graph)
-    previous_nodes = [-1] * len(graph)
-    distances[u] = 0
+    # The source is always the first node settled, its relaxations are the initial state of the queue
+    _, _, relaxed = next(steps)
 
-    for edge in graph[u]:
-        distances[edge[0]] = edge[1]
-        previous_nodes[edge[0]] = u
-        queue.put((edge[1], edge[0]))
-        yield f"Added the edge from {u} to {edge[0]} with distance {edge[1]} to the priority queue\n"
+    for (v, weight, _, _) in relaxed:
+        yield f"Added the edge from {u} to {v} with distance {weight} to the priority queue\n"
 
     yield f"The initial distances from the node {u} are:\n"
     yield latex_to_markdown(matrix_to_markdown([distances]))
 
-    counter = 1
-    while not queue.empty():
-        distance, node = queue.get()
+    for counter, (node, distance, relaxed) in enumerate(steps, 1):
 
         yield f"### Step {counter}\n"
         yield f"Removed the edge with distance {distance} and node {node} from the priority queue\n"
-        counter += 1
 
-        for edge in graph[node]:
+        if node == target:
+            yield f"The target {target} has been removed from the priority queue, so its distance is final\n"
+            break
 
-            new_distance = distances[node] + edge[1]
-            if distances[edge[0]] > new_distance:
-                yield f"Updated the distance to the node {edge[0]} from {distances[edge[0]]} to {new_distance}\n"
-                yield f"Added the edge from {node} to {edge[0]} with distance " \
-                      f"{edge[1]} to the priority queue\n"
-
-                distances[edge[0]] = distances[node] + edge[1]
-                previous_nodes[edge[0]] = node
-                queue.put((distances[edge[0]], edge[0]))
+        for (v, weight, old_distance, new_distance) in relaxed:
+            yield f"Updated the distance to the node {v} from {old_distance} to {new_distance}\n"
+            yield f"Added the edge from {node} to {v} with distance " \
+                  f"{weight} to the priority queue\n"
 
         yield f"The distances from the node {u} are:\n"
         yield latex_to_markdown(matrix_to_markdown([distances]))
@@ -65,6 +105,21 @@ def dijkstra(input_graph: str) -> Union[str, Graph]:
         )
 
     yield "### Final result\n"
+
+    if target is not None:
+        path = shortest_path(previous_nodes, u, target)
+
+        if path:
+            yield f"The shortest distance from the node {u} to the node {target} is {distances[target]}\n"
+            yield f"The shortest path is {' -> '.join(str(node) for node in path)} and it is marked in green:\n"
+        else:
+            yield f"There is no path from the node {u} to the node {target}\n"
+
+        yield draw_graph(
+            len(graph), edge_list, weighted=True, directed=False, edges_selected=set(zip(path, path[1:]))
+        )
+        return
+
     yield f"The final distances from the node {u} are:\n"
     yield latex_to_markdown(matrix_to_markdown([distances]))
     yield f"The edges that define the minimum paths are marked in green:\n"
@@ -73,6 +128,275 @@ def dijkstra(input_graph: str) -> Union[str, Graph]:
     )
 
 
+def dijkstra_solve(graph: Union[ParsedGraph, CSRGraph],
+                   source: int,
+                   target: Optional[int] = None,
+                   queue: Optional[Union[BinaryHeap, BucketQueue, RadixHeap]] = None) -> Tuple[array, array]:
+    """
+    Computes the shortest paths from the source to all the nodes without generating any step of the resolution.
+    If a target is given, the search stops as soon as the target is settled, so only the distances of the nodes
+    settled before it are final.
+    :param graph: The graph, either parsed or in CSR format.
+    :param source: The source vertex.
+    :param target: The target vertex, if only the shortest path to it is needed.
+    :param queue: The empty priority queue to use, by default one of the type chosen by dijkstra_priority_queue.
+    :return: The distances from the source (infinity if unreachable) and the previous node
+    of every node in its shortest path (-1 for the source and the unreachable nodes).
+    """
+    distances = array("d", [inf]) * len(graph)
+    previous_nodes = array("i", [-1]) * len(graph)
+
+    for _ in dijkstra_steps(graph, source, distances, previous_nodes, target=target, queue=queue):
+        pass
+
+    return distances, previous_nodes
+
+
+def cached_dijkstra_solve(graph: Union[ParsedGraph, CSRGraph],
+                          source: int,
+                          cache: LRUCache = shortest_path_cache) -> Tuple[array, array]:
+    """
+    Same as dijkstra_solve, but the results are stored in a cache keyed by the fingerprint of the graph and the source,
+    so repeated queries over the same graph only copy the stored distances and previous nodes.
+    :param graph: The graph, either parsed or in CSR format.
+    :param source: The source vertex.
+    :param cache: The cache where the results are stored.
+    :return: The distances from the source and the previous node of every node in its shortest path.
+    """
+    key = ("dijkstra", graph_fingerprint(graph), source)
+    result = cache.get(key)
+
+    if result is None:
+        result = dijkstra_solve(graph, source)
+        cache.put(key, result)
+
+    distances, previous_nodes = result
+
+    return array("d", distances), array("i", previous_nodes)
+
+
+def dijkstra_batch(input_graph: Union[str, ParsedGraph, CSRGraph],
+                   sources: Iterable[int],
+                   max_workers: Optional[int] = None) -> Iterator[Tuple[int, array]]:
+    """
+    Computes the shortest paths from many sources over the same graph using a pool of processes.
+    The graph is converted to CSR format once and copied to shared memory, where every worker reads it
+    without copying it, and the sources are distributed among the workers.
+    :param input_graph: The string representation of the graph, the graph already parsed or a CSR graph.
+    :param sources: The source vertices.
+    :param max_workers: The number of processes, by default the number of CPUs.
+    :return: For every source, in the same order, the source and its distances to all the nodes.
+    """
+    graph = as_csr_graph(input_graph, directed=False, weighted=True)
+    sources = list(sources)
+    max_workers = max_workers or os.cpu_count() or 1
+
+    memory, layout = share_arrays({"offsets": graph.offsets, "targets": graph.targets, "weights": graph.weights})
+
+    try:
+        with ProcessPoolExecutor(
+                max_workers, initializer=__attach_graph, initargs=(memory.name, layout, graph.n, graph.directed)
+        ) as executor:
+            chunk_size = max(1, len(sources) // (4 * max_workers))
+
+            for source, distances in zip(sources, executor.map(__solve_from_source, sources, chunksize=chunk_size)):
+                yield source, distances
+
+    finally:
+        release_shared_memory(memory)
+
+
+def __attach_graph(name: str, layout: SharedArraysLayout, n: int, directed: bool):
+    """
+    Initializer of the workers of dijkstra_batch, attaches to the graph in shared memory.
+    :param name: The name of the shared memory block.
+    :param layout: The layout of the arrays of the graph inside the block.
+    :param n: The number of nodes.
+    :param directed: Whether the graph is directed or not.
+    """
+    global __worker_memory, __worker_graph, __worker_new_queue
+
+    __worker_memory = attach_shared_memory(name)
+    arrays = shared_arrays(__worker_memory, layout)
+    __worker_graph = CSRGraph(n, arrays["offsets"], arrays["targets"], arrays["weights"], directed)
+    __worker_new_queue = dijkstra_priority_queue(__worker_graph)
+
+
+def __solve_from_source(source: int) -> array:
+    """
+    Task of the workers of dijkstra_batch, computes the distances from a source over the shared graph.
+    :param source: The source vertex.
+    :return: The distances from the source.
+    """
+    distances, _ = dijkstra_solve(__worker_graph, source, queue=__worker_new_queue())
+    return distances
+
+
+def dijkstra_steps(graph: Union[ParsedGraph, CSRGraph],
+                   source: int,
+                   distances: MutableSequence[float],
+                   previous_nodes: MutableSequence[int],
+                   record: bool = False,
+                   target: Optional[int] = None,
+                   queue: Optional[Union[BinaryHeap, BucketQueue, RadixHeap]] = None) \
+        -> Iterator[Tuple[int, float, Optional[List[Tuple[int, float, float, float]]]]]:
+    """
+    Dijkstra's algorithm over a priority queue with lazy deletion: instead of updating the priority of a node,
+    a new entry is pushed and the stale ones are skipped when popped, so every node is settled only once.
+    The distances and the previous nodes are updated in place.
+    :param graph: The graph, either parsed or in CSR format.
+    :param source: The source vertex.
+    :param distances: The distances from the source, initialized to infinity.
+    :param previous_nodes: The previous node of every node in its shortest path, initialized to -1.
+    :param record: Whether the relaxations done when settling every node are recorded.
+    :param target: The target vertex, the search stops as soon as it is settled without relaxing its edges.
+    :param queue: The empty priority queue to use, by default one of the type chosen by dijkstra_priority_queue.
+    :return: For every node settled, the node, its distance and, if recorded, the list of relaxations
+    as tuples (node, weight of the edge, old distance, new distance).
+    """
+    if queue is None:
+        queue = dijkstra_priority_queue(graph)()
+
+    push, pop = queue.push, queue.pop
+
+    settled = bytearray(len(graph))
+    push((0.0, source))
+    distances[source] = 0.0
+
+    while True:
+        try:
+            distance, node = pop()
+        except IndexError:
+            break
+
+        if settled[node]:
+            continue
+
+        settled[node] = True
+        relaxed = [] if record else None
+
+        if node == target:
+            yield node, distance, relaxed
+            return
+
+        for (neighbour, weight) in graph[node]:
+            new_distance = distance + weight
+
+            if new_distance < distances[neighbour]:
+                if record:
+                    relaxed.append((neighbour, weight, distances[neighbour], new_distance))
+
+                distances[neighbour] = new_distance
+                previous_nodes[neighbour] = node
+                push((new_distance, neighbour))
+
+        yield node, distance, relaxed
+
+
+def dijkstra_priority_queue(graph: Union[ParsedGraph, CSRGraph]) -> Callable[[], Union[BinaryHeap, BucketQueue]]:
+    """
+    Chooses the priority queue for Dijkstra's algorithm from the weights of the graph. With small integer weights,
+    a bucket queue pops in constant time; otherwise a binary heap is used. A radix heap is not chosen, as it is
+    not faster than the binary heap in practice, but it can be given to dijkstra_solve.
+    The weights are only scanned the first time for every graph.
+    :param graph: The graph, either parsed or in CSR format.
+    :return: A function that creates an empty priority queue of the chosen type.
+    """
+    max_weight = max_integer_weight(graph)
+
+    if max_weight is None or max_weight > BUCKET_QUEUE_MAX_WEIGHT:
+        return BinaryHeap
+
+    return partial(BucketQueue, max_weight)
+
+
+def bidirectional_dijkstra(graph: Union[ParsedGraph, CSRGraph],
+                           source: int,
+                           target: int,
+                           reversed_graph: Optional[Union[ParsedGraph, CSRGraph]] = None) -> Tuple[float, List[int]]:
+    """
+    Computes the shortest path between two nodes running two searches, one forward from the source and one
+    backward from the target, always advancing the one with the closest node in its queue. The searches stop
+    when the sum of the smallest distances of both queues can not improve the best path found through a node
+    reached by both. The distances are kept in dictionaries, so the cost only depends on the explored nodes.
+    :param graph: The graph, either parsed or in CSR format.
+    :param source: The source vertex.
+    :param target: The target vertex.
+    :param reversed_graph: The graph with its edges reversed, by default built when the graph is directed.
+    :return: The distance from the source to the target (infinity if unreachable) and the nodes of the path.
+    """
+    if source == target:
+        return 0.0, [source]
+
+    if reversed_graph is None:
+        reversed_graph = reverse_graph(graph)
+
+    graphs = (graph, reversed_graph)
+    distances = ({source: 0.0}, {target: 0.0})
+    previous_nodes = ({source: -1}, {target: -1})
+    settled = (set(), set())
+    heaps = ([(0.0, source)], [(0.0, target)])
+
+    best_distance = inf
+    meeting_node = -1
+
+    while heaps[0] and heaps[1] and heaps[0][0][0] + heaps[1][0][0] < best_distance:
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        distance, node = heappop(heaps[side])
+
+        if node in settled[side]:
+            continue
+
+        settled[side].add(node)
+        side_distances, other_distances = distances[side], distances[1 - side]
+
+        for (neighbour, weight) in graphs[side][node]:
+            new_distance = distance + weight
+
+            if new_distance < side_distances.get(neighbour, inf):
+                side_distances[neighbour] = new_distance
+                previous_nodes[side][neighbour] = node
+                heappush(heaps[side], (new_distance, neighbour))
+
+            if neighbour in other_distances and new_distance + other_distances[neighbour] < best_distance:
+                best_distance = new_distance + other_distances[neighbour]
+                meeting_node = neighbour
+
+    if meeting_node == -1:
+        return inf, []
+
+    path = shortest_path(previous_nodes[0], source, meeting_node)
+    node = previous_nodes[1][meeting_node]
+
+    while node != -1:
+        path.append(node)
+        node = previous_nodes[1][node]
+
+    return best_distance, path
+
+
+def shortest_path(previous_nodes: Union[Sequence[int], Dict[int, int]], source: int, target: int) -> List[int]:
+    """
+    Rebuilds the shortest path from the source to the target following the previous nodes.
+    :param previous_nodes: The previous node of every node in its shortest path, -1 for the source.
+    :param source: The source vertex.
+    :param target: The target vertex.
+    :return: The nodes of the path from the source to the target, empty if the target was not reached.
+    """
+    path = [target]
+
+    while path[-1] != source:
+        node = previous_nodes[path[-1]]
+
+        if node == -1:
+            return []
+
+        path.append(node)
+
+    path.reverse()
+    return path
+
+
 def __get_edges_selected(previous_nodes) -> Set[Tuple[int, int]]:
     edges_selected = set()
 
@@ -1,13 +1,57 @@
-from utils.markdown_utils import markdown_table
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from functools import partial
+from typing import List, Tuple, Optional, Sequence, Dict
+
+from utils.markdown_utils import markdown_table, MatrixTrace
+from utils.shared_memory_utils import (
+    SharedArraysLayout,
+    create_shared_arrays,
+    shared_arrays,
+    attach_shared_memory,
+    release_shared_memory,
+)
+
+"""
+Minimum number of pairs of strings for which the distance matrix is computed by a pool of processes
+"""
+EDIT_DISTANCE_PARALLEL_MIN_PAIRS = 1 << 12
+
+"""
+Strings and condensed distance matrix shared by the parent process, attached once by every worker
+of edit_distance_matrix
+"""
+__worker_memory = None
+__worker_strings = None
+__worker_packed = None
+__worker_distances = None
+
+
+class EditOperation(Enum):
+    """
+    Enum for the operations of an edit script
+    """
+
+    KEEP = "keep"
+    SUBSTITUTE = "substitute"
+    INSERT = "insert"
+    DELETE = "delete"
+
+
+"""
+An operation of an edit script as a tuple (operation, i, j), where i is the position in the first string
+and j the position in the second string where the operation is done
+"""
+EditStep = Tuple[EditOperation, int, int]
 
 
 def edit_distance(input_string: str) -> str:
     """
     Computes the edit distance between two strings.
     """
-    lines = input_string.splitlines()
-    string1 = lines[0]
-    string2 = lines[1]
+    string1, string2 = __parse_input(input_string)
     n = len(string1)
     m = len(string2)
     dp = [[0 for _ in range(m + 1)] for _ in range(n + 1)]
@@ -23,8 +67,11 @@ def edit_distance(input_string: str) -> str:
 
     yield "The table have been filled with the base cases " \
           "that are the edit distance between an empty string and a non-empty string."
+    trace = MatrixTrace(dp, partial(markdown_table, headers_row=headers_rows, headers_column=headers_columns),
+                        "edit-distance")
+
     yield "Note: '$' Represents the empty string."
-    yield markdown_table(dp, headers_rows, headers_columns)
+    yield trace.snapshot()
 
     yield "Having filled the table with the base cases, we can now fill the rest of the table."
 
@@ -36,11 +83,407 @@ def edit_distance(input_string: str) -> str:
             else:
                 dp[i][j] = min(dp[i - 1][j - 1], dp[i - 1][j], dp[i][j - 1]) + 1
 
-        yield f"After filling the row {i}, the table is:"
-        yield markdown_table(dp, headers_rows, headers_columns)
+        yield f"The values of the row {i} are:"
+        yield trace.record([(i, j, dp[i][j]) for j in range(1, m + 1)])
         yield "\n"
 
     yield "### Final result\n"
     yield f"The final table is:"
     yield markdown_table(dp, headers_rows, headers_columns)
     yield f"The edit distance between {string1} and {string2} is {dp[n][m]}."
+
+
+def edit_distance_result(input_string: str) -> int:
+    """
+    Computes the edit distance between the two strings of the input without the resolution.
+    :param input_string: The two strings in two different lines, the same input of edit_distance.
+    :return: The edit distance.
+    """
+    return bit_parallel_edit_distance(*__parse_input(input_string))
+
+
+def edit_distance_solve(string1: str, string2: str) -> int:
+    """
+    Computes the edit distance between two strings without the resolution, keeping only two rows of the table
+    as long as the shortest string, so it uses O(min(n, m)) memory.
+    :param string1: The first string.
+    :param string2: The second string.
+    :return: The edit distance.
+    """
+    if len(string1) < len(string2):
+        string1, string2 = string2, string1
+
+    return __last_row(string1, string2)[-1]
+
+
+def bit_parallel_edit_distance(string1: str, string2: str) -> int:
+    """
+    Computes the edit distance between two strings with the bit-parallel algorithm of Myers, as formulated by Hyyrö.
+    Every column of the table is encoded by the differences between consecutive cells, which are -1, 0 or +1,
+    in two bit vectors of positive and negative vertical deltas. A whole column is computed from the previous one with
+    a constant number of bitwise operations over Python integers used as bit vectors as long as the longest string,
+    so there is one Python iteration per character of the shortest string instead of one per cell.
+    :param string1: The first string.
+    :param string2: The second string.
+    :return: The edit distance.
+    """
+    pattern, text = (string1, string2) if len(string1) >= len(string2) else (string2, string1)
+
+    return __bit_parallel_distance(__pattern_masks(pattern), len(pattern), text)
+
+
+def __pattern_masks(pattern: str) -> Dict[str, int]:
+    """
+    Computes the bit vectors of the pattern for the bit-parallel algorithm: the bit i of the mask of a character
+    is set if the pattern has that character at the position i.
+    :param pattern: The pattern.
+    :return: The mask of every character of the pattern.
+    """
+    masks = {}
+
+    for i, character in enumerate(pattern):
+        masks[character] = masks.get(character, 0) | (1 << i)
+
+    return masks
+
+
+def __bit_parallel_distance(masks: Dict[str, int], m: int, text: str) -> int:
+    """
+    Computes the edit distance between a pattern, given by its masks, and a text with the bit-parallel algorithm.
+    :param masks: The masks of the pattern.
+    :param m: The length of the pattern.
+    :param text: The text.
+    :return: The edit distance.
+    """
+    if m == 0:
+        return len(text)
+
+    all_ones = (1 << m) - 1
+    last_bit = 1 << (m - 1)
+    positive_vertical = all_ones
+    negative_vertical = 0
+    distance = m
+
+    for character in text:
+        equal = masks.get(character, 0)
+        vertical = equal | negative_vertical
+        horizontal = (((equal & positive_vertical) + positive_vertical) ^ positive_vertical) | equal
+
+        positive_horizontal = (negative_vertical | ~(horizontal | positive_vertical)) & all_ones
+        negative_horizontal = positive_vertical & horizontal
+
+        # The last cell of the column is the distance to the prefix of the text processed so far
+        if positive_horizontal & last_bit:
+            distance += 1
+        elif negative_horizontal & last_bit:
+            distance -= 1
+
+        # The first row grows by one in every column, so a positive delta is shifted in
+        positive_horizontal = (positive_horizontal << 1) | 1
+        negative_horizontal <<= 1
+
+        positive_vertical = (negative_horizontal | ~(vertical | positive_horizontal)) & all_ones
+        negative_vertical = positive_horizontal & vertical & all_ones
+
+    return distance
+
+
+def banded_edit_distance(string1: str, string2: str, threshold: int) -> Optional[int]:
+    """
+    Computes the edit distance between two strings only if it is not greater than a threshold k, with Ukkonen's
+    banded algorithm. A path through a cell (i, j) costs at least |i - j|, so only the 2k + 1 diagonals around the main
+    one are computed, and the computation stops as soon as every cell of a row exceeds k, taking O(k * n) time.
+    :param string1: The first string.
+    :param string2: The second string.
+    :param threshold: The maximum edit distance of interest k.
+    :return: The edit distance, or None if it is greater than the threshold.
+    """
+    n, m = len(string1), len(string2)
+
+    if abs(n - m) > threshold:
+        return None
+
+    # The cell (i, j) is stored at the position j - i + k of the row, the cells outside the band are worth k + 1
+    width = 2 * threshold + 1
+    outside = threshold + 1
+    previous = [d - threshold if d >= threshold else outside for d in range(width)]
+
+    for i in range(1, n + 1):
+        character1 = string1[i - 1]
+        current = [outside] * width
+
+        for d in range(max(0, threshold - i), min(width, m - i + threshold + 1)):
+            j = i + d - threshold
+
+            if j == 0:
+                current[d] = i
+                continue
+
+            cost = previous[d] + (character1 != string2[j - 1])
+
+            if d + 1 < width and previous[d + 1] + 1 < cost:
+                cost = previous[d + 1] + 1
+
+            if d > 0 and current[d - 1] + 1 < cost:
+                cost = current[d - 1] + 1
+
+            current[d] = min(cost, outside)
+
+        if min(current) > threshold:
+            return None
+
+        previous = current
+
+    distance = previous[m - n + threshold]
+
+    return distance if distance <= threshold else None
+
+
+def edit_script(string1: str, string2: str) -> List[EditStep]:
+    """
+    Computes a minimum sequence of operations that transforms the first string into the second one with Hirschberg's
+    algorithm, in linear memory: the first string is split in half and the split point of the second string is the
+    one where the edit distances of the left halves, computed forwards, and of the right halves, computed backwards,
+    add up to the minimum. Both halves are then solved recursively.
+    :param string1: The first string.
+    :param string2: The second string.
+    :return: The operations (operation, i, j) in order, where i is the position in the first string and j the position
+    in the second string. The number of operations other than EditOperation.KEEP is the edit distance.
+    """
+    script = []
+    __hirschberg(string1, string2, 0, 0, script)
+    return script
+
+
+def edit_distance_matrix(strings: Sequence[str], max_workers: Optional[int] = None) -> array:
+    """
+    Computes the edit distance between every pair of strings, without the resolution, with the bit-parallel algorithm.
+    All the strings are packed side by side in the same bit vectors, so a whole row of the matrix, the distances
+    between a string and all the next ones, is computed at once with one Python iteration per character of the string.
+    The result is the condensed distance matrix, the upper triangle of the matrix stored row by row in an array of
+    C integers written directly by a pool of processes in shared memory. Every worker receives the strings once and
+    computes whole rows of the matrix.
+    :param strings: The strings.
+    :param max_workers: The number of processes, by default the number of CPUs. With one, no pool is used.
+    :return: The condensed distance matrix, the distance between the strings i and j, with i < j, is at the position
+    n * i - i * (i + 1) / 2 + j - i - 1.
+    """
+    strings = list(strings)
+    n = len(strings)
+    pairs = n * (n - 1) // 2
+    max_workers = max_workers or os.cpu_count() or 1
+
+    if max_workers == 1 or pairs < EDIT_DISTANCE_PARALLEL_MIN_PAIRS:
+        distances = array("i", [0]) * pairs
+        packed = __pack_strings(strings)
+
+        for i in range(n - 1):
+            __distance_row(strings, packed, distances, i)
+
+        return distances
+
+    memory, layout = create_shared_arrays({"distances": ("i", pairs)})
+
+    try:
+        with ProcessPoolExecutor(
+                max_workers, initializer=__attach_distances, initargs=(memory.name, layout, strings)
+        ) as executor:
+            # The first rows are the longest ones, so they are sent first and in small chunks to balance the work
+            chunk_size = max(1, n // (16 * max_workers))
+            list(executor.map(__shared_distance_row, range(n - 1), chunksize=chunk_size))
+
+        view = shared_arrays(memory, layout)["distances"]
+        distances = array("i", view)
+        view.release()
+
+        return distances
+
+    finally:
+        release_shared_memory(memory)
+
+
+def __pack_strings(strings: Sequence[str]) -> Tuple[Dict[str, int], int, int, List[int]]:
+    """
+    Packs all the strings as patterns of the bit-parallel algorithm in the same bit vectors. Every string has a lane
+    of its length plus one guard bit, which is always cleared, so the carries and the shifts do not cross the lanes.
+    :param strings: The strings.
+    :return: The mask of every character, the mask of the bits of the strings, the mask of the first bit of every
+    non-empty string and the offset of every lane followed by the total number of bits.
+    """
+    offsets = [0]
+
+    for string in strings:
+        offsets.append(offsets[-1] + len(string) + 1)
+
+    # The bits are set in byte arrays and converted to integers at the end, instead of growing the integers
+    size = (offsets[-1] + 7) // 8
+    masks: Dict[str, bytearray] = {}
+    all_ones = bytearray(size)
+    first_bits = bytearray(size)
+
+    for string, offset in zip(strings, offsets):
+        if string:
+            first_bits[offset >> 3] |= 1 << (offset & 7)
+
+        for position, character in enumerate(string, offset):
+            if character not in masks:
+                masks[character] = bytearray(size)
+
+            masks[character][position >> 3] |= 1 << (position & 7)
+            all_ones[position >> 3] |= 1 << (position & 7)
+
+    return (
+        {character: int.from_bytes(mask, "little") for character, mask in masks.items()},
+        int.from_bytes(all_ones, "little"),
+        int.from_bytes(first_bits, "little"),
+        offsets
+    )
+
+
+def __distance_row(strings: Sequence[str],
+                   packed: Tuple[Dict[str, int], int, int, List[int]],
+                   distances: Sequence[int],
+                   i: int):
+    """
+    Computes the row i of the condensed distance matrix, the distances between the string i and the next strings,
+    running the bit-parallel algorithm with the string i as the text over the lanes of all the next strings at once.
+    The distance of every lane is read from the last column, the length of the text plus the vertical deltas.
+    :param strings: The strings.
+    :param packed: The strings packed by __pack_strings.
+    :param distances: The condensed distance matrix.
+    :param i: The row.
+    """
+    n = len(strings)
+    start = n * i - i * (i + 1) // 2
+    masks, all_ones, first_bits, offsets = packed
+
+    # The lanes of the strings up to i are dropped
+    shift = offsets[i + 1]
+    masks = {character: mask >> shift for character, mask in masks.items()}
+    all_ones >>= shift
+    first_bits >>= shift
+
+    positive_vertical = all_ones
+    negative_vertical = 0
+
+    for character in strings[i]:
+        equal = masks.get(character, 0)
+        vertical = equal | negative_vertical
+        horizontal = (((equal & positive_vertical) + positive_vertical) ^ positive_vertical) | equal
+
+        positive_horizontal = (negative_vertical | ~(horizontal | positive_vertical)) & all_ones
+        negative_horizontal = positive_vertical & horizontal
+
+        positive_horizontal = (positive_horizontal << 1) | first_bits
+        negative_horizontal <<= 1
+
+        positive_vertical = (negative_horizontal | ~(vertical | positive_horizontal)) & all_ones
+        negative_vertical = positive_horizontal & vertical & all_ones
+
+    # The bits as strings with the bit k at the position k, to count the deltas of every lane
+    positive_bits = bin(positive_vertical)[:1:-1]
+    negative_bits = bin(negative_vertical)[:1:-1]
+    length = len(strings[i])
+
+    for j in range(i + 1, n):
+        lane_start, lane_end = offsets[j] - shift, offsets[j + 1] - shift
+        distances[start + j - i - 1] = \
+            length + positive_bits.count("1", lane_start, lane_end) - negative_bits.count("1", lane_start, lane_end)
+
+
+def __attach_distances(name: str, layout: SharedArraysLayout, strings: List[str]):
+    """
+    Initializer of the workers of edit_distance_matrix, attaches to the distance matrix in shared memory.
+    :param name: The name of the shared memory block.
+    :param layout: The layout of the distance matrix inside the block.
+    :param strings: The strings.
+    """
+    global __worker_memory, __worker_strings, __worker_packed, __worker_distances
+
+    __worker_memory = attach_shared_memory(name)
+    __worker_distances = shared_arrays(__worker_memory, layout)["distances"]
+    __worker_strings = strings
+    __worker_packed = __pack_strings(strings)
+
+
+def __shared_distance_row(i: int):
+    """
+    Task of the workers of edit_distance_matrix, computes a row of the shared distance matrix.
+    :param i: The row.
+    """
+    __distance_row(__worker_strings, __worker_packed, __worker_distances, i)
+
+
+def __parse_input(input_string: str) -> Tuple[str, str]:
+    """
+    Reads the two strings of the input.
+    :param input_string: The two strings in two different lines.
+    :return: The two strings.
+    """
+    lines = input_string.splitlines()
+    return lines[0], lines[1]
+
+
+def __last_row(string1: str, string2: str) -> List[int]:
+    """
+    Computes the last row of the table of the edit distance keeping only two rows,
+    that is, the edit distance between the first string and every prefix of the second string.
+    :param string1: The first string.
+    :param string2: The second string.
+    :return: The edit distances between the first string and the prefixes of the second string.
+    """
+    previous = list(range(len(string2) + 1))
+
+    for i, character1 in enumerate(string1, 1):
+        current = [i]
+        left, diagonal = i, i - 1
+
+        # The cells to the left and in the diagonal are kept in variables instead of indexing the rows
+        for up, character2 in zip(previous[1:], string2):
+            left = min(up + 1, left + 1, diagonal + (character1 != character2))
+            current.append(left)
+            diagonal = up
+
+        previous = current
+
+    return previous
+
+
+def __hirschberg(string1: str, string2: str, offset1: int, offset2: int, script: List[EditStep]):
+    """
+    Appends to the script the operations that transform the first string into the second one.
+    :param string1: The first string.
+    :param string2: The second string.
+    :param offset1: The position of the first string in the original first string.
+    :param offset2: The position of the second string in the original second string.
+    :param script: The operations found so far.
+    """
+    n, m = len(string1), len(string2)
+
+    if n == 0:
+        script.extend((EditOperation.INSERT, offset1, offset2 + j) for j in range(m))
+        return
+
+    if m == 0:
+        script.extend((EditOperation.DELETE, offset1 + i, offset2) for i in range(n))
+        return
+
+    if n == 1:
+        # The only character is kept if it appears in the second string, otherwise it is substituted by the first one
+        kept = string2.find(string1)
+        matched = kept if kept != -1 else 0
+        operation = EditOperation.KEEP if kept != -1 else EditOperation.SUBSTITUTE
+
+        script.extend((EditOperation.INSERT, offset1, offset2 + j) for j in range(matched))
+        script.append((operation, offset1, offset2 + matched))
+        script.extend((EditOperation.INSERT, offset1 + 1, offset2 + j) for j in range(matched + 1, m))
+        return
+
+    middle = n // 2
+    left = __last_row(string1[:middle], string2)
+    right = __last_row(string1[middle:][::-1], string2[::-1])
+
+    split = min(range(m + 1), key=lambda j: left[j] + right[m - j])
+
+    __hirschberg(string1[:middle], string2[:split], offset1, offset2, script)
+    __hirschberg(string1[middle:], string2[split:], offset1 + middle, offset2 + split, script)
@@ -1,46 +1,375 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import Union, Iterator, Tuple, Optional, List
+
+import numpy as np
+
 from utils.draw_utils import draw_graph
-from utils.graph_utils import input_to_adjacency_list, adjacency_list_to_list_of_edges
-from utils.markdown_utils import matrix_to_markdown, latex_to_markdown
+from utils.cache_utils import LRUCache, shortest_path_cache
+from utils.graph_utils import ParsedGraph, CSRGraph, as_parsed_graph, graph_fingerprint
+from utils.markdown_utils import matrix_to_markdown, latex_to_markdown, MatrixTrace
+from utils.shared_memory_utils import (
+    SharedArraysLayout,
+    create_shared_arrays,
+    shared_arrays,
+    attach_shared_memory,
+    release_shared_memory,
+)
+
+FLOYD_WARSHALL_BLOCK_SIZE = 256
 
+"""
+Distance matrix shared by the parent process, attached once by every worker of floyd_warshall_blocked
+"""
+__worker_memory = None
+__worker_distance = None
 
-def floyd_warshall(input_graph):
+
+def floyd_warshall(input_graph: Union[str, ParsedGraph, CSRGraph]):
     """
     Computes the shortest path between all pairs of nodes in a graph.
-    :param input_graph: The graph.
+    :param input_graph: The graph, either its string representation, already parsed or a CSR graph.
     :return: The shortest path between all pairs of nodes in a graph.
     """
-    graph = input_to_adjacency_list(input_graph, directed=True, weighted=True)
-    edge_list = adjacency_list_to_list_of_edges(graph)
+    graph = as_parsed_graph(input_graph, directed=True, weighted=True)
+    edge_list = graph.edges
 
     n = len(graph)
-    distance = [[float('inf') for _ in range(n)] for _ in range(n)]
-
-    for i in range(n):
-        distance[i][i] = 0
-
-    for u in range(n):
-        for v, w in graph[u]:
-            distance[u][v] = w
+    distance = floyd_warshall_initial_matrix(graph)
 
     yield "## Floyd-Warshall Algorithm resolution"
     yield "The graph is:"
-    yield draw_graph(len(graph), edge_list, weighted=True, directed=True)
+    yield draw_graph(len(graph), edge_list, weighted=True, directed=graph.directed)
+    trace = MatrixTrace(
+        distance.tolist(),
+        lambda matrix, highlighted: latex_to_markdown(matrix_to_markdown(matrix, highlighted)),
+        "floyd-warshall"
+    )
+
     yield "The initial distance matrix is (only is known the distance to the neighbors):"
-    yield latex_to_markdown(matrix_to_markdown(distance))
+    yield trace.snapshot()
 
-    for k in range(n):
+    for k, updated in floyd_warshall_steps(distance, record=True):
         yield f"### Step {k + 1} (paths using nodes {', '.join(str(i) for i in range(k + 1))})\n"
-        for i in range(n):
-            for j in range(n):
 
-                if distance[i][k] + distance[k][j] < distance[i][j]:
-                    yield f"The distance between {i} and {j} has been updated as the path " \
-                          f"{i} -> {k} -> {j} is shorter than the current best path {i} -> {j}\n"
-                    distance[i][j] = distance[i][k] + distance[k][j]
+        updated_pairs = np.argwhere(updated).tolist()
+
+        for i, j in updated_pairs:
+            yield f"The distance between {i} and {j} has been updated as the path " \
+                  f"{i} -> {k} -> {j} is shorter than the current best path {i} -> {j}\n"
 
-        yield f"The distance matrix after step {k + 1} is:\n"
-        yield latex_to_markdown(matrix_to_markdown(distance))
+        yield f"The distances updated in step {k + 1} are:\n"
+        yield trace.record([(i, j, distance[i, j].item()) for i, j in updated_pairs])
 
     yield "### Final result\n"
     yield f"The final distance matrix is:\n"
-    yield latex_to_markdown(matrix_to_markdown(distance))
+    yield latex_to_markdown(matrix_to_markdown(distance.tolist()))
+
+
+def floyd_warshall_solve(graph: Union[ParsedGraph, CSRGraph]) -> np.ndarray:
+    """
+    Computes the shortest path between all pairs of nodes without generating any step of the resolution.
+    :param graph: The graph, either parsed or in CSR format.
+    :return: The n x n distance matrix, infinity if there is no path.
+    """
+    distance = floyd_warshall_initial_matrix(graph)
+
+    for _ in floyd_warshall_steps(distance):
+        pass
+
+    return distance
+
+
+def floyd_warshall_initial_matrix(graph: Union[ParsedGraph, CSRGraph]) -> np.ndarray:
+    """
+    Builds the distance matrix before any step of Floyd-Warshall: zero in the diagonal, the weight of the lightest
+    edge between every pair of neighbours and infinity everywhere else.
+    :param graph: The graph, either parsed or in CSR format.
+    :return: The n x n distance matrix.
+    """
+    if isinstance(graph, ParsedGraph) and isinstance(graph.adjacency, CSRGraph):
+        graph = graph.adjacency
+
+    n = len(graph)
+
+    if isinstance(graph, CSRGraph):
+        offsets = np.frombuffer(memoryview(graph.offsets), dtype=np.intc)
+        sources = np.repeat(np.arange(n), np.diff(offsets))
+        targets = np.frombuffer(memoryview(graph.targets), dtype=np.intc)
+        weights = np.frombuffer(memoryview(graph.weights), dtype=np.float64)
+    else:
+        degrees = [len(graph[u]) for u in range(n)]
+        sources = np.repeat(np.arange(n), degrees)
+        arcs = np.fromiter(chain.from_iterable(chain.from_iterable(graph[u] for u in range(n))),
+                           dtype=np.float64, count=2 * len(sources)).reshape(-1, 2)
+        targets, weights = arcs[:, 0].astype(np.intc), arcs[:, 1]
+
+    distance = np.full((n, n), np.inf)
+    np.minimum.at(distance, (sources, targets), weights)
+    np.fill_diagonal(distance, 0)
+
+    return distance
+
+
+def floyd_warshall_steps(distance: np.ndarray,
+                         record: bool = False,
+                         next_hop: Optional[np.ndarray] = None) -> Iterator[Tuple[int, Optional[np.ndarray]]]:
+    """
+    Floyd-Warshall's algorithm over a NumPy distance matrix, updated in place. Every step k relaxes all the pairs
+    at once through the node k with a single broadcast: D = min(D, D[:, k] + D[k, :]).
+    The row and the column k do not change during the step k, so the update can be done in place,
+    and the candidate distances of every step are written to the same buffer.
+    :param distance: The n x n distance matrix, initialized as in floyd_warshall_initial_matrix.
+    :param record: Whether the pairs updated in every step are recorded.
+    :param next_hop: The n x n next-hop matrix, initialized as in floyd_warshall_initial_next_hop,
+    it is updated in place if given: the path from i to j now starts as the path from i to k.
+    :return: For every step, the node k and, if recorded, the boolean matrix of the pairs updated.
+    """
+    candidate = np.empty_like(distance)
+
+    for k in range(distance.shape[0]):
+        np.add(distance[:, k, None], distance[None, k, :], out=candidate)
+        updated = candidate < distance if record or next_hop is not None else None
+
+        if next_hop is not None:
+            np.copyto(next_hop, next_hop[:, k, None], where=updated)
+
+        np.minimum(distance, candidate, out=distance)
+
+        yield k, updated
+
+
+def floyd_warshall_initial_next_hop(distance: np.ndarray) -> np.ndarray:
+    """
+    Builds the next-hop matrix before any step of Floyd-Warshall: the next node of the path from i to j is j
+    when they are neighbours, i when they are the same node and -1 when there is no path yet.
+    :param distance: The n x n initial distance matrix.
+    :return: The n x n next-hop matrix.
+    """
+    n = distance.shape[0]
+    next_hop = np.where(np.isfinite(distance), np.arange(n)[None, :], -1).astype(np.intc)
+    np.fill_diagonal(next_hop, np.arange(n))
+
+    return next_hop
+
+
+class AllPairsShortestPaths:
+
+    def __init__(self, graph: Union[ParsedGraph, CSRGraph]):
+        """
+        Shortest paths between all pairs of nodes computed with Floyd-Warshall, keeping alongside the distance
+        matrix a next-hop matrix to rebuild the paths. It can be kept up to date when an edge is inserted or its
+        weight drops, repairing the matrices in O(n^2) instead of running the O(n^3) algorithm again.
+        :param graph: The graph, either parsed or in CSR format.
+        """
+        self.directed = graph.directed
+        self.weights = floyd_warshall_initial_matrix(graph)
+        self.distance = self.weights.copy()
+        self.next_hop = floyd_warshall_initial_next_hop(self.weights)
+
+        for _ in floyd_warshall_steps(self.distance, next_hop=self.next_hop):
+            pass
+
+    def path(self, source: int, target: int) -> List[int]:
+        """
+        Rebuilds the shortest path between two nodes following the next-hop matrix.
+        :param source: The source vertex.
+        :param target: The target vertex.
+        :return: The nodes of the path from the source to the target, empty if there is no path.
+        """
+        if self.next_hop[source, target] == -1:
+            return []
+
+        path = [source]
+
+        while path[-1] != target:
+            path.append(int(self.next_hop[path[-1], target]))
+
+        return path
+
+    def update_edge(self, u: int, v: int, weight: float):
+        """
+        Sets the weight of the edge from u to v, inserting it if it does not exist. If the weight does not increase,
+        the only new shortest paths are the ones through the edge, so every pair (i, j) is relaxed at once with
+        D[i][u] + weight + D[v][j] in O(n^2). If the weight of an existing edge increases, some shortest paths
+        may be lost and all the pairs are computed again.
+        :param u: The source of the edge.
+        :param v: The target of the edge.
+        :param weight: The new weight of the edge.
+        """
+        increased = weight > self.weights[u, v]
+        self.weights[u, v] = weight
+
+        if not self.directed:
+            self.weights[v, u] = weight
+
+        if increased:
+            self.distance = self.weights.copy()
+            self.next_hop = floyd_warshall_initial_next_hop(self.weights)
+
+            for _ in floyd_warshall_steps(self.distance, next_hop=self.next_hop):
+                pass
+
+            return
+
+        self.__relax_edge(u, v, weight)
+
+        if not self.directed:
+            self.__relax_edge(v, u, weight)
+
+    def __relax_edge(self, u: int, v: int, weight: float):
+        """
+        Relaxes all the pairs of nodes through the edge from u to v.
+        :param u: The source of the edge.
+        :param v: The target of the edge.
+        :param weight: The weight of the edge.
+        """
+        candidate = self.distance[:, u, None] + weight + self.distance[None, v, :]
+        updated = candidate < self.distance
+
+        # The improved paths from i start as the path from i to u, except the ones from u that start with the edge
+        first_hop = self.next_hop[:, u].copy()
+        first_hop[u] = v
+
+        np.copyto(self.next_hop, first_hop[:, None], where=updated)
+        np.minimum(self.distance, candidate, out=self.distance)
+
+
+def floyd_warshall_blocked(graph: Union[ParsedGraph, CSRGraph],
+                           block_size: int = FLOYD_WARSHALL_BLOCK_SIZE,
+                           max_workers: Optional[int] = None) -> np.ndarray:
+    """
+    Blocked Floyd-Warshall: the matrix is split in tiles of block_size x block_size that fit in the cache, and for
+    every block of nodes k the tiles are updated in three phases:
+        1. The diagonal tile (k, k), with the classic algorithm restricted to it.
+        2. The tiles of the row k and the column k, which only depend on themselves and the diagonal tile.
+        3. The remaining tiles (i, j), which only depend on the tiles (i, k) and (k, j) of the phase 2.
+    The tiles of the phases 2 and 3 are independent of each other, so they are updated by a pool of processes
+    over a distance matrix in shared memory.
+    :param graph: The graph, either parsed or in CSR format.
+    :param block_size: The number of rows and columns of every tile.
+    :param max_workers: The number of processes, by default the number of CPUs. With one, no pool is used.
+    :return: The n x n distance matrix, infinity if there is no path.
+    """
+    initial_distance = floyd_warshall_initial_matrix(graph)
+    n = initial_distance.shape[0]
+    blocks = (n + block_size - 1) // block_size
+    max_workers = max_workers or os.cpu_count() or 1
+
+    if max_workers == 1 or blocks == 1:
+        for k in range(blocks):
+            for tiles in __blocked_phases(blocks, k):
+                for (i, j) in tiles:
+                    __update_tile(initial_distance, block_size, i, j, k)
+
+        return initial_distance
+
+    memory, layout = create_shared_arrays({"distance": ("d", n * n)})
+
+    try:
+        distance = np.frombuffer(shared_arrays(memory, layout)["distance"], dtype=np.float64).reshape(n, n)
+        distance[:] = initial_distance
+        del initial_distance
+
+        with ProcessPoolExecutor(
+                max_workers, initializer=__attach_distance, initargs=(memory.name, layout, n)
+        ) as executor:
+            for k in range(blocks):
+                for tiles in __blocked_phases(blocks, k):
+                    chunk_size = max(1, len(tiles) // (4 * max_workers))
+                    tasks = [(block_size, i, j, k) for (i, j) in tiles]
+
+                    # Waiting for all the tiles of a phase before starting the next one
+                    list(executor.map(__update_shared_tile, tasks, chunksize=chunk_size))
+
+        result = distance.copy()
+        del distance
+
+        return result
+
+    finally:
+        release_shared_memory(memory)
+
+
+def __blocked_phases(blocks: int, k: int) -> List[List[Tuple[int, int]]]:
+    """
+    Returns the tiles updated in every phase of the block k of the blocked Floyd-Warshall.
+    :param blocks: The number of blocks in every row and column.
+    :param k: The block of nodes used as intermediate nodes.
+    :return: The list of tiles (i, j) of every phase.
+    """
+    others = [i for i in range(blocks) if i != k]
+
+    return [
+        [(k, k)],
+        [(k, j) for j in others] + [(i, k) for i in others],
+        [(i, j) for i in others for j in others],
+    ]
+
+
+def __update_tile(distance: np.ndarray, block_size: int, i: int, j: int, k: int):
+    """
+    Relaxes the tile (i, j) of the distance matrix through the nodes of the block k, in place.
+    When the tile is in the row or the column k it is one of its own operands, and as in the classic algorithm
+    the row and the column of every node k do not change while it is used, so the update stays correct.
+    :param distance: The n x n distance matrix.
+    :param block_size: The number of rows and columns of every tile.
+    :param i: The block of rows of the tile.
+    :param j: The block of columns of the tile.
+    :param k: The block of intermediate nodes.
+    """
+    rows = slice(i * block_size, (i + 1) * block_size)
+    columns = slice(j * block_size, (j + 1) * block_size)
+    nodes = slice(k * block_size, (k + 1) * block_size)
+
+    tile = distance[rows, columns]
+    left = distance[rows, nodes]
+    top = distance[nodes, columns]
+    candidate = np.empty_like(tile)
+
+    for node in range(left.shape[1]):
+        np.add(left[:, node, None], top[None, node, :], out=candidate)
+        np.minimum(tile, candidate, out=tile)
+
+
+def __attach_distance(name: str, layout: SharedArraysLayout, n: int):
+    """
+    Initializer of the workers of floyd_warshall_blocked, attaches to the distance matrix in shared memory.
+    :param name: The name of the shared memory block.
+    :param layout: The layout of the distance matrix inside the block.
+    :param n: The number of nodes.
+    """
+    global __worker_memory, __worker_distance
+
+    __worker_memory = attach_shared_memory(name)
+    __worker_distance = np.frombuffer(
+        shared_arrays(__worker_memory, layout)["distance"], dtype=np.float64
+    ).reshape(n, n)
+
+
+def __update_shared_tile(task: Tuple[int, int, int, int]):
+    """
+    Task of the workers of floyd_warshall_blocked, updates a tile of the shared distance matrix.
+    :param task: Tuple (block_size, i, j, k) as in __update_tile.
+    """
+    __update_tile(__worker_distance, *task)
+
+
+def cached_floyd_warshall_solve(graph: Union[ParsedGraph, CSRGraph],
+                                cache: LRUCache = shortest_path_cache) -> np.ndarray:
+    """
+    Same as floyd_warshall_solve, but the results are stored in a cache keyed by the fingerprint of the graph,
+    so repeated queries over the same graph only copy the stored distance matrix.
+    :param graph: The graph, either parsed or in CSR format.
+    :param cache: The cache where the results are stored.
+    :return: The n x n distance matrix, infinity if there is no path.
+    """
+    key = ("floyd_warshall", graph_fingerprint(graph), None)
+    distance = cache.get(key)
+
+    if distance is None:
+        distance = floyd_warshall_solve(graph)
+        cache.put(key, distance)
+
+    return distance.copy()
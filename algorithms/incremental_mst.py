@@ -0,0 +1,133 @@
+from typing import List, Tuple, Optional, Iterable, Dict
+
+from data_structures.disjoint_set_union import DisjointSetUnion
+
+
+class IncrementalMST:
+
+    def __init__(self, n: int):
+        """
+        Minimum spanning forest of a graph whose edges arrive over time, kept up to date after every insertion
+        instead of running Kruskal's algorithm again over the whole graph.
+        An edge between two different trees always joins them, which is checked with a disjoint set union.
+        Otherwise the edge closes a cycle in a tree, and the heaviest edge of that cycle is dropped, which is either
+        the new edge or the heaviest edge of the path between its endpoints in the tree. Finding that path takes
+        time linear in the size of the tree, but the trees never hold more than n - 1 edges.
+        :param n: The number of nodes.
+        """
+        self.n = n
+        self._dsu = DisjointSetUnion(n)
+        self._adjacency: List[Dict[int, float]] = [{} for _ in range(n)]
+        self._total_weight = 0
+
+    @property
+    def total_weight(self) -> float:
+        """
+        The total weight of the minimum spanning forest.
+        """
+        return self._total_weight
+
+    @property
+    def edges(self) -> List[Tuple[int, int, float]]:
+        """
+        The edges (u, v, weight) of the minimum spanning forest, with u < v.
+        """
+        return [(u, v, weight) for u in range(self.n) for v, weight in self._adjacency[u].items() if u < v]
+
+    @property
+    def components(self) -> int:
+        """
+        The number of trees of the forest.
+        """
+        return self._dsu.components
+
+    def insert_edge(self, u: int, v: int, weight: float) -> Optional[Tuple[int, int, float]]:
+        """
+        Inserts an edge in the graph and updates the minimum spanning forest.
+        :param u: An endpoint of the edge.
+        :param v: The other endpoint of the edge.
+        :param weight: The weight of the edge.
+        :return: The edge discarded from the forest, which may be the new edge, or None if no edge is discarded.
+        """
+        if u == v:
+            return u, v, weight
+
+        if self._dsu.union(u, v):
+            self.__link(u, v, weight)
+            return None
+
+        heaviest = self.__heaviest_edge_on_path(u, v)
+
+        if heaviest[2] <= weight:
+            return u, v, weight
+
+        self.__cut(heaviest[0], heaviest[1])
+        self.__link(u, v, weight)
+
+        return heaviest
+
+    def insert_edges(self, edges: Iterable[Tuple[int, int, float]]) -> Tuple[float, List[Tuple[int, int, float]]]:
+        """
+        Inserts a batch of edges in the graph and updates the minimum spanning forest.
+        :param edges: The edges (u, v, weight) to insert.
+        :return: The total weight and the edges of the minimum spanning forest after the batch.
+        """
+        for u, v, weight in edges:
+            self.insert_edge(u, v, weight)
+
+        return self.total_weight, self.edges
+
+    def __link(self, u: int, v: int, weight: float):
+        """
+        Adds an edge to the forest.
+        :param u: An endpoint of the edge.
+        :param v: The other endpoint of the edge.
+        :param weight: The weight of the edge.
+        """
+        self._adjacency[u][v] = weight
+        self._adjacency[v][u] = weight
+        self._total_weight += weight
+
+    def __cut(self, u: int, v: int):
+        """
+        Removes an edge from the forest.
+        :param u: An endpoint of the edge.
+        :param v: The other endpoint of the edge.
+        """
+        self._total_weight -= self._adjacency[u].pop(v)
+        del self._adjacency[v][u]
+
+    def __heaviest_edge_on_path(self, u: int, v: int) -> Tuple[int, int, float]:
+        """
+        Finds the heaviest edge on the path between two nodes of the same tree, with a depth-first search from u.
+        :param u: The first node.
+        :param v: The last node, in the same tree as u.
+        :return: The heaviest edge (a, b, weight) of the path.
+        """
+        parents = {u: u}
+        stack = [u]
+
+        while stack:
+            node = stack.pop()
+
+            if node == v:
+                break
+
+            for neighbour in self._adjacency[node]:
+                if neighbour not in parents:
+                    parents[neighbour] = node
+                    stack.append(neighbour)
+
+        heaviest = None
+        node = v
+
+        while node != u:
+            parent = parents[node]
+            weight = self._adjacency[node][parent]
+
+            if heaviest is None or weight > heaviest[2]:
+                heaviest = (parent, node, weight)
+
+            node = parent
+
+        return heaviest
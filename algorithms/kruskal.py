@@ -1,22 +1,25 @@
-from typing import Union
+from operator import itemgetter
+from typing import Union, List, Tuple, Iterable
 
 from graphviz import Graph, Digraph
 
 from data_structures.disjoint_set_union import DisjointSetUnion
 from utils.draw_utils import draw_graph, draw_disjoint_sets
-from utils.graph_utils import input_to_adjacency_list, adjacency_list_to_list_of_edges
+from utils.graph_utils import ParsedGraph, CSRGraph, as_parsed_graph
 
+KRUSKAL_SORT_THRESHOLD = 4096
 
-def kruskal_algorithm(input_graph: str) -> Union[str, Graph, Digraph]:
+
+def kruskal_algorithm(input_graph: Union[str, ParsedGraph, CSRGraph]) -> Union[str, Graph, Digraph]:
     """
     Kruskal's algorithm for finding the minimum spanning tree of a graph
-    :param input_graph: string representation of the graph
+    :param input_graph: string representation of the graph, the graph already parsed or a CSR graph
     :return: A list with the elements to render in the frontend that represent the resolution of the algorithm.
     """
 
-    graph = input_to_adjacency_list(input_graph, directed=False, weighted=True)
+    graph = as_parsed_graph(input_graph, directed=False, weighted=True)
 
-    edge_list = adjacency_list_to_list_of_edges(graph)
+    edge_list = graph.edges
 
     yield "## Kruskal's algorithm resolution"
     yield "The initial graph is the following:"
@@ -29,9 +32,7 @@ def kruskal_algorithm(input_graph: str) -> Union[str, Graph, Digraph]:
     edges_selected = set()
     total_weight = 0
 
-    edge_list = list(filter(lambda x: x[0] < x[1], edge_list))
-
-    edge_list.sort(key=lambda x: x[2])
+    edge_list = sorted(edge_list, key=lambda x: x[2])
     yield "The edges of the graph sorted by weight are the following:"
     yield " | ".join([f"({edge[0]}, {edge[1]})" for edge in edge_list])
 
@@ -43,8 +44,7 @@ def kruskal_algorithm(input_graph: str) -> Union[str, Graph, Digraph]:
 
         yield f"### Step {edge_index + 1}\n"
 
-        if dsu.find(u) != dsu.find(v):
-            dsu.union(u, v)
+        if dsu.union(u, v):
             edges_selected.add((u, v))
             total_weight += weight
 
@@ -63,3 +63,87 @@ def kruskal_algorithm(input_graph: str) -> Union[str, Graph, Digraph]:
     yield "The final graph is the following:"
     yield draw_graph(len(graph), edge_list, weighted=True, directed=False, edges_selected=edges_selected)
     yield f"The total weight of the MST is {total_weight}"
+
+
+def kruskal_solve(input_graph: Union[str, ParsedGraph, CSRGraph]) -> Tuple[List[Tuple[int, int, float]], float]:
+    """
+    Kruskal's algorithm without the resolution, using Filter-Kruskal: the edges are split around a pivot weight
+    and the light edges are processed first. Before splitting a group of heavy edges the ones already inside
+    a component are dropped, and once the tree has n - 1 edges the remaining groups are never sorted.
+    Only the groups with less than KRUSKAL_SORT_THRESHOLD edges are sorted.
+    :param input_graph: string representation of the graph, the graph already parsed or a CSR graph
+    :return: The edges of the minimum spanning tree (or forest) and its total weight.
+    """
+    graph = as_parsed_graph(input_graph, directed=False, weighted=True)
+
+    dsu = DisjointSetUnion(len(graph))
+    mst_edges = []
+    max_edges = len(graph) - 1
+
+    # Groups of edges still to process with the size of the tree when they were filtered, the lightest group is
+    # the last one. A group is only filtered again if some edge has been added to the tree since then.
+    pending = [(list(graph.edges), 0)]
+
+    while pending and len(mst_edges) < max_edges:
+        edges, filtered_size = pending.pop()
+
+        if len(edges) > KRUSKAL_SORT_THRESHOLD and filtered_size < len(mst_edges):
+            edges = __filter_edges(dsu, edges)
+
+        if len(edges) > KRUSKAL_SORT_THRESHOLD:
+            pivot = __pivot_weight(edges)
+            light = [edge for edge in edges if edge[2] < pivot]
+
+            # With many edges of the same weight there may be nothing lighter than the pivot, so the group is split
+            # in the edges with the pivot weight, that can be taken in any order, and the heavier ones
+            if light:
+                pending.append(([edge for edge in edges if edge[2] >= pivot], len(mst_edges)))
+                pending.append((light, len(mst_edges)))
+            else:
+                pending.append(([edge for edge in edges if edge[2] > pivot], len(mst_edges)))
+                __add_edges(dsu, mst_edges, max_edges, [edge for edge in edges if edge[2] == pivot])
+
+            continue
+
+        __add_edges(dsu, mst_edges, max_edges, sorted(edges, key=itemgetter(2)))
+
+    return mst_edges, sum(weight for _, _, weight in mst_edges)
+
+
+def __filter_edges(dsu: DisjointSetUnion, edges: List[Tuple[int, int, float]]) -> List[Tuple[int, int, float]]:
+    """
+    Drops the edges whose endpoints are already in the same component.
+    :param dsu: The components of the tree built so far.
+    :param edges: The edges to filter.
+    :return: The edges joining two different components.
+    """
+    find = dsu.find
+    return [edge for edge in edges if find(edge[0]) != find(edge[1])]
+
+
+def __pivot_weight(edges: List[Tuple[int, int, float]]) -> float:
+    """
+    Chooses the pivot to split a group of edges as the median of the weights of the first, middle and last edges.
+    :param edges: The edges, not empty.
+    :return: The pivot weight.
+    """
+    return sorted((edges[0][2], edges[len(edges) // 2][2], edges[-1][2]))[1]
+
+
+def __add_edges(dsu: DisjointSetUnion,
+                mst_edges: List[Tuple[int, int, float]],
+                max_edges: int,
+                edges: Iterable[Tuple[int, int, float]]):
+    """
+    Adds to the tree, in order, the edges joining two different components, until it has max_edges edges.
+    :param dsu: The components of the tree built so far.
+    :param mst_edges: The edges of the tree built so far.
+    :param max_edges: The number of edges of a spanning tree.
+    :param edges: The edges sorted by weight.
+    """
+    for edge in edges:
+        if len(mst_edges) == max_edges:
+            return
+
+        if dsu.union(edge[0], edge[1]):
+            mst_edges.append(edge)
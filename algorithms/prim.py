@@ -1,23 +1,38 @@
-from queue import PriorityQueue
+from array import array
+from itertools import chain
 from random import randint
-from typing import Union, List, Optional
+from typing import Union, List, Optional, Tuple
 
+import numpy as np
 from graphviz import Graph
 
+from algorithms.floyd_warshall import floyd_warshall_initial_matrix
 from utils.draw_utils import draw_graph
-from utils.graph_utils import input_to_adjacency_list, adjacency_list_to_list_of_edges
+from data_structures.binary_heap import BinaryHeap
+from data_structures.bucket_queue import BucketQueue, BUCKET_QUEUE_MAX_WEIGHT
+from data_structures.indexed_heap import IndexedHeap
+from utils.graph_utils import ParsedGraph, CSRGraph, as_parsed_graph, max_integer_weight
 
 
-def prim_algorithm(input_string: str) -> Optional[List[Union[str, Graph]]]:
+"""
+Fraction of all the possible edges from which a graph is considered dense,
+then Prim's algorithm scans the arrays of keys in O(n^2) instead of using a heap
+"""
+PRIM_DENSE_THRESHOLD = 0.25
+
+
+def prim_algorithm(input_string: Union[str, ParsedGraph, CSRGraph],
+                   start: Optional[int] = None) -> Optional[List[Union[str, Graph]]]:
     """
     Prim's algorithm is a greedy algorithm that finds a minimum spanning tree for a weighted undirected graph.
-    :param input_string: The string representation of the graph.
+    :param input_string: The string representation of the graph, the graph already parsed or a CSR graph.
+    :param start: The node where the tree starts, if it is not given it is selected randomly.
     :return: A list with the elements to render in the frontend that represent the resolution of the algorithm.
     """
 
-    graph = input_to_adjacency_list(input_string, directed=False, weighted=True)
+    graph = as_parsed_graph(input_string, directed=False, weighted=True)
 
-    edge_list = adjacency_list_to_list_of_edges(graph)
+    edge_list = graph.edges
 
     yield "# Prim's algorithm resolution"
     yield "The initial graph is the following:"
@@ -25,10 +40,14 @@ def prim_algorithm(input_string: str) -> Optional[List[Union[str, Graph]]]:
 
     set_visited = set()
     edges_selected = set()
-    queue = PriorityQueue()
+    queue = prim_priority_queue(graph)
 
-    node = randint(0, len(graph) - 1)
-    yield f"Starting from the node {node} selected randomly\n"
+    if start is None:
+        node = randint(0, len(graph) - 1)
+        yield f"Starting from the node {node} selected randomly\n"
+    else:
+        node = start
+        yield f"Starting from the node {node}\n"
 
     set_visited.add(node)
     step = 1
@@ -42,10 +61,10 @@ def prim_algorithm(input_string: str) -> Optional[List[Union[str, Graph]]]:
         for (neighbor, weight) in graph[node]:
             if neighbor not in set_visited:
                 yield f"Added the edge from {node} to {neighbor} with weight {weight} to the priority queue\n"
-                queue.put((weight, (node, neighbor)))
+                queue.push((weight, (node, neighbor)))
 
-        while not queue.empty():
-            weight, (u, v) = queue.get()
+        while queue:
+            weight, (u, v) = queue.pop()
             if v not in set_visited:
                 break
 
@@ -63,3 +82,111 @@ def prim_algorithm(input_string: str) -> Optional[List[Union[str, Graph]]]:
     yield "The final graph is the following:"
     yield draw_graph(len(graph), edge_list, weighted=True, directed=False, edges_selected=edges_selected)
     yield f"The total weight of the MST is {total_weight}"
+
+
+def prim_priority_queue(graph: Union[ParsedGraph, CSRGraph]) -> Union[BinaryHeap, BucketQueue]:
+    """
+    Chooses the priority queue for Prim's algorithm from the weights of the graph. The keys are the weights
+    of the edges, so with small integer weights a bucket queue pops in constant time, otherwise a binary heap is used.
+    :param graph: The graph, either parsed or in CSR format.
+    :return: An empty priority queue.
+    """
+    max_weight = max_integer_weight(graph)
+
+    if max_weight is None or max_weight > BUCKET_QUEUE_MAX_WEIGHT:
+        return BinaryHeap()
+
+    return BucketQueue(max_weight)
+
+
+def prim_solve(input_graph: Union[str, ParsedGraph, CSRGraph],
+               start: int = 0) -> Tuple[List[Tuple[int, int, float]], float]:
+    """
+    Prim's algorithm without the resolution. If the graph is dense the keys are kept in arrays that are scanned
+    in O(n^2), otherwise they are kept in an indexed heap with decrease-key in O((n + m) log n).
+    If the graph is not connected, a tree is grown from the lowest node not reached yet, giving a spanning forest.
+    :param input_graph: The string representation of the graph, the graph already parsed or a CSR graph.
+    :param start: The node where the tree starts.
+    :return: The edges (parent, node, weight) of the minimum spanning tree in the order they are added
+    and its total weight.
+    """
+    graph = as_parsed_graph(input_graph, directed=False, weighted=True)
+    n = len(graph)
+
+    if graph.m >= PRIM_DENSE_THRESHOLD * n * (n - 1) / 2:
+        mst_edges = __prim_dense(graph, start)
+    else:
+        mst_edges = __prim_heap(graph, start)
+
+    return mst_edges, sum(weight for _, _, weight in mst_edges)
+
+
+def __prim_heap(graph: ParsedGraph, start: int) -> List[Tuple[int, int, float]]:
+    """
+    Prim's algorithm with an indexed heap of the nodes not in the tree, keyed by their lightest edge to the tree.
+    :param graph: The graph.
+    :param start: The node where the tree starts.
+    :return: The edges of the minimum spanning forest.
+    """
+    n = len(graph)
+    heap = IndexedHeap(n)
+    parents = array('i', [-1]) * n
+    visited = bytearray(n)
+    mst_edges = []
+
+    for root in chain((start,), range(n)):
+        if visited[root]:
+            continue
+
+        heap.push((0.0, root))
+
+        while heap:
+            weight, node = heap.pop()
+            visited[node] = 1
+
+            if node != root:
+                mst_edges.append((parents[node], node, weight))
+
+            for neighbour, weight in graph[node]:
+                if not visited[neighbour] and heap.push((weight, neighbour)):
+                    parents[neighbour] = node
+
+    return mst_edges
+
+
+def __prim_dense(graph: ParsedGraph, start: int) -> List[Tuple[int, int, float]]:
+    """
+    Prim's algorithm for dense graphs over the weight matrix: every step scans the keys of all the nodes to take
+    the lightest one and updates the keys with its row, both vectorized.
+    :param graph: The graph.
+    :param start: The node where the tree starts.
+    :return: The edges of the minimum spanning forest.
+    """
+    n = len(graph)
+    weights = floyd_warshall_initial_matrix(graph.adjacency)
+    keys = np.full(n, np.inf)
+    parents = np.full(n, -1, dtype=np.intc)
+    in_tree = np.zeros(n, dtype=bool)
+    mst_edges = []
+
+    keys[start] = 0.0
+
+    for _ in range(n):
+        candidates = np.where(in_tree, np.inf, keys)
+        node = int(np.argmin(candidates))
+
+        if candidates[node] == np.inf:
+            # The rest of the nodes are not reachable, so a new tree starts from the lowest one
+            node = int(np.argmin(in_tree))
+
+        elif parents[node] != -1:
+            mst_edges.append((int(parents[node]), node, keys[node].item()))
+
+        in_tree[node] = True
+
+        row = weights[node]
+        improved = (row < keys) & ~in_tree
+        keys[improved] = row[improved]
+        parents[improved] = node
+
+    return mst_edges
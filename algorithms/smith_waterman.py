@@ -1,4 +1,53 @@
-from utils.markdown_utils import markdown_table
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from functools import partial
+from heapq import heappush, heappushpop
+from itertools import islice
+from typing import Tuple, List, Iterator, Callable, Optional, Iterable
+
+import numpy as np
+
+from utils.fasta_utils import read_fasta
+from utils.markdown_utils import markdown_table, MatrixTrace
+
+SMITH_WATERMAN_MATCH_SCORE = 2
+SMITH_WATERMAN_MISMATCH_PENALTY = -1
+SMITH_WATERMAN_GAP_PENALTY = -1
+
+"""
+Directions of the traceback of Smith-Waterman, the move that gives the score of every cell
+"""
+TRACEBACK_STOP = 0
+TRACEBACK_DIAGONAL = 1
+TRACEBACK_UP = 2
+TRACEBACK_LEFT = 3
+
+"""
+Number of records of the database scored by every task of smith_waterman_search
+"""
+SMITH_WATERMAN_SEARCH_BATCH_SIZE = 64
+
+"""
+Query and scoring parameters sent once to every worker of smith_waterman_search
+"""
+__worker_query = None
+__worker_scoring = None
+
+
+class SearchHit:
+
+    def __init__(self, header: str, score: int, position: Tuple[int, int], alignment: Tuple[str, str]):
+        """
+        Record of a database that aligns with the query in smith_waterman_search.
+        :param header: The description of the record.
+        :param score: The score of the optimal local alignment.
+        :param position: The end (i, j) of the alignment in the query and in the sequence of the record.
+        :param alignment: The alignment of the query and the sequence of the record, with '-' for the gaps.
+        """
+        self.header = header
+        self.score = score
+        self.position = position
+        self.alignment = alignment
 
 
 def smith_waterman(input_string: str) -> str:
@@ -17,9 +66,9 @@ def smith_waterman(input_string: str) -> str:
     m = len(sequence2)
 
     # Scoring parameters
-    match_score = 2
-    mismatch_penalty = -1
-    gap_penalty = -1
+    match_score = SMITH_WATERMAN_MATCH_SCORE
+    mismatch_penalty = SMITH_WATERMAN_MISMATCH_PENALTY
+    gap_penalty = SMITH_WATERMAN_GAP_PENALTY
 
     # Initialize scoring matrix
     score_matrix = [[0 for _ in range(m + 1)] for _ in range(n + 1)]
@@ -46,7 +95,10 @@ def smith_waterman(input_string: str) -> str:
         "The scoring matrix is initialized with zeros. Unlike global alignment (Needleman-Wunsch), "
         "the first row and column remain zero to allow local alignments to start anywhere."
     )
-    yield markdown_table(score_matrix, headers_rows, headers_columns)
+    trace = MatrixTrace(score_matrix,
+                        partial(markdown_table, headers_row=headers_rows, headers_column=headers_columns),
+                        "smith-waterman")
+    yield trace.snapshot()
     yield ""
 
     yield "### Filling the Scoring Matrix"
@@ -97,8 +149,8 @@ def smith_waterman(input_string: str) -> str:
                 yield f"  - **Chosen:** {score_matrix[i][j]}"
                 yield ""
 
-        yield f"After processing row {i}:"
-        yield markdown_table(score_matrix, headers_rows, headers_columns)
+        yield f"After processing row {i}, the cells that changed are:"
+        yield trace.record([(i, j, score_matrix[i][j]) for j in range(1, m + 1) if score_matrix[i][j] != 0])
         yield ""
 
     yield "### Traceback"
@@ -195,3 +247,546 @@ def smith_waterman(input_string: str) -> str:
 
     yield "### Complete Scoring Matrix"
     yield markdown_table(score_matrix, headers_rows, headers_columns)
+
+
+def smith_waterman_solve(sequence1: str,
+                         sequence2: str,
+                         match_score: int = SMITH_WATERMAN_MATCH_SCORE,
+                         mismatch_penalty: int = SMITH_WATERMAN_MISMATCH_PENALTY,
+                         gap_penalty: int = SMITH_WATERMAN_GAP_PENALTY) -> Tuple[int, Tuple[int, int], Tuple[str, str]]:
+    """
+    Smith-Waterman algorithm without the resolution, vectorized with NumPy over the anti-diagonals of the matrix.
+    The cells (i, j) with the same i + j only depend on the two previous anti-diagonals, so every anti-diagonal is
+    computed at once. The match and mismatch scores are read from a query profile, the score of every character
+    against every position of the second sequence, instead of comparing the characters.
+    The direction of every cell is stored in a byte for the traceback, with the same preference as smith_waterman:
+    diagonal, up and left. Only the scores of the last two anti-diagonals are kept, but the directions of all of them
+    are, so the traceback needs O(n * m) bytes. smith_waterman_linear recovers the alignment in linear memory.
+    :param sequence1: The first sequence.
+    :param sequence2: The second sequence.
+    :param match_score: The score of a match.
+    :param mismatch_penalty: The score of a mismatch.
+    :param gap_penalty: The score of a gap.
+    :return: The maximum score, its position (i, j) and the optimal local alignment of both sequences,
+    with '-' for the gaps.
+    """
+    max_score, position, directions = __wavefront(sequence1, sequence2, match_score, mismatch_penalty, gap_penalty)
+    alignment = __traceback(sequence1, sequence2, position, lambda i, j: directions[i + j][1][i - directions[i + j][0]])
+
+    return max_score, position, alignment
+
+
+def __encode(sequence1: str, sequence2: str) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Encodes both sequences as arrays of integer codes, one for every different character.
+    :param sequence1: The first sequence.
+    :param sequence2: The second sequence.
+    :return: The codes of both sequences and the number of different characters.
+    """
+    alphabet = {character: code for code, character in enumerate(sorted(set(sequence1) | set(sequence2)))}
+    codes1 = np.fromiter((alphabet[character] for character in sequence1), dtype=np.intp, count=len(sequence1))
+    codes2 = np.fromiter((alphabet[character] for character in sequence2), dtype=np.intp, count=len(sequence2))
+
+    return codes1, codes2, len(alphabet)
+
+
+def __substitution_matrix(alphabet_size: int, match_score: int, mismatch_penalty: int) -> np.ndarray:
+    """
+    Builds the score of every pair of character codes.
+    :param alphabet_size: The number of different characters.
+    :param match_score: The score of a match.
+    :param mismatch_penalty: The score of a mismatch.
+    :return: The alphabet_size x alphabet_size matrix of scores.
+    """
+    return np.where(np.eye(alphabet_size, dtype=bool), match_score, mismatch_penalty).astype(np.int32)
+
+
+def smith_waterman_score(sequence1: str,
+                         sequence2: str,
+                         match_score: int = SMITH_WATERMAN_MATCH_SCORE,
+                         mismatch_penalty: int = SMITH_WATERMAN_MISMATCH_PENALTY,
+                         gap_penalty: int = SMITH_WATERMAN_GAP_PENALTY) -> Tuple[int, Tuple[int, int]]:
+    """
+    Smith-Waterman algorithm without the resolution and without the alignment, keeping only two rows of the matrix.
+    :param sequence1: The first sequence.
+    :param sequence2: The second sequence.
+    :param match_score: The score of a match.
+    :param mismatch_penalty: The score of a mismatch.
+    :param gap_penalty: The score of a gap.
+    :return: The maximum score and its first position (i, j) by rows.
+    """
+    codes1, codes2, alphabet_size = __encode(sequence1, sequence2)
+    substitution = __substitution_matrix(alphabet_size, match_score, mismatch_penalty)
+
+    max_score, position = 0, (0, 0)
+
+    for i, (row, _, _) in enumerate(__rows(codes1, codes2, substitution, gap_penalty, local=True), 1):
+        best = int(row.argmax())
+
+        if row[best] > max_score:
+            max_score, position = int(row[best]), (i, best)
+
+    return max_score, position
+
+
+def smith_waterman_linear(sequence1: str,
+                          sequence2: str,
+                          match_score: int = SMITH_WATERMAN_MATCH_SCORE,
+                          mismatch_penalty: int = SMITH_WATERMAN_MISMATCH_PENALTY,
+                          gap_penalty: int = SMITH_WATERMAN_GAP_PENALTY,
+                          packed_traceback: bool = False) -> Tuple[int, Tuple[int, int], Tuple[str, str]]:
+    """
+    Smith-Waterman algorithm without the resolution in linear memory. The maximum score and where the alignment ends
+    are found keeping two rows. Then, as in Myers and Miller, the start of the alignment is found with a pass from
+    the end backwards, and the alignment between the start and the end, which is a global alignment, is recovered
+    with Hirschberg's divide and conquer.
+    Alternatively, the directions of all the cells are stored in a byte array with two bits per cell,
+    which still needs memory for the whole matrix, a quarter of a byte per cell, but recovers the alignment directly.
+    :param sequence1: The first sequence.
+    :param sequence2: The second sequence.
+    :param match_score: The score of a match.
+    :param mismatch_penalty: The score of a mismatch.
+    :param gap_penalty: The score of a gap.
+    :param packed_traceback: Whether the alignment is recovered from the packed directions of the cells.
+    :return: The maximum score, its position (i, j) and the optimal local alignment of both sequences,
+    with '-' for the gaps.
+    """
+    codes1, codes2, alphabet_size = __encode(sequence1, sequence2)
+    substitution = __substitution_matrix(alphabet_size, match_score, mismatch_penalty)
+
+    if packed_traceback:
+        max_score, position, direction = __packed_directions(codes1, codes2, substitution, gap_penalty)
+        return max_score, position, __traceback(sequence1, sequence2, position, direction)
+
+    max_score, position = smith_waterman_score(sequence1, sequence2, match_score, mismatch_penalty, gap_penalty)
+
+    if max_score == 0:
+        return max_score, position, ("", "")
+
+    end1, end2 = position
+    start1, start2 = __alignment_start(codes1[:end1], codes2[:end2], substitution, gap_penalty, max_score)
+
+    aligned1, aligned2 = [], []
+    __hirschberg(sequence1[start1:end1], sequence2[start2:end2], codes1[start1:end1], codes2[start2:end2],
+                 substitution, gap_penalty, aligned1, aligned2)
+
+    return max_score, position, ("".join(aligned1), "".join(aligned2))
+
+
+def smith_waterman_search(query: str,
+                          database_path: str,
+                          top_k: int = 10,
+                          max_workers: Optional[int] = None,
+                          max_in_flight: Optional[int] = None,
+                          match_score: int = SMITH_WATERMAN_MATCH_SCORE,
+                          mismatch_penalty: int = SMITH_WATERMAN_MISMATCH_PENALTY,
+                          gap_penalty: int = SMITH_WATERMAN_GAP_PENALTY) -> List[SearchHit]:
+    """
+    Searches the records of a FASTA database that align best with a query. The records are read as a stream and sent
+    in batches to a pool of processes that compute only the scores, in linear memory. At most max_in_flight batches are
+    pending at a time and only the best top_k records are kept in a heap, so the memory does not depend on the size
+    of the database. The alignments are recovered at the end, only for the best records.
+    :param query: The query sequence.
+    :param database_path: The path of the FASTA file.
+    :param top_k: The number of records to report.
+    :param max_workers: The number of processes, by default the number of CPUs. With one, no pool is used.
+    :param max_in_flight: The maximum number of batches sent to the pool and not finished, by default twice the number
+    of processes.
+    :param match_score: The score of a match.
+    :param mismatch_penalty: The score of a mismatch.
+    :param gap_penalty: The score of a gap.
+    :return: The best records from the highest score to the lowest, the first records of the database win the ties.
+    """
+    scoring = (match_score, mismatch_penalty, gap_penalty)
+    max_workers = max_workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * max_workers
+
+    # Min-heap of (score, -index, header, sequence), so the worst record kept is the first one
+    best_records = []
+
+    def keep(batch: List[Tuple[int, Tuple[str, str]]], scores: List[int]):
+        for (index, (header, sequence)), score in zip(batch, scores):
+            if len(best_records) < top_k:
+                heappush(best_records, (score, -index, header, sequence))
+            else:
+                heappushpop(best_records, (score, -index, header, sequence))
+
+    if top_k <= 0:
+        return []
+
+    batches = __batches(enumerate(read_fasta(database_path)), SMITH_WATERMAN_SEARCH_BATCH_SIZE)
+
+    if max_workers == 1:
+        for batch in batches:
+            keep(batch, [smith_waterman_score(query, sequence, *scoring)[0] for _, (_, sequence) in batch])
+
+    else:
+        with ProcessPoolExecutor(max_workers, initializer=__set_query, initargs=(query, scoring)) as executor:
+            pending = {}
+
+            for batch in batches:
+                if len(pending) >= max_in_flight:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                    for future in done:
+                        keep(pending.pop(future), future.result())
+
+                pending[executor.submit(__score_sequences, [sequence for _, (_, sequence) in batch])] = batch
+
+            for future in pending:
+                keep(pending[future], future.result())
+
+    return [
+        SearchHit(header, *smith_waterman_linear(query, sequence, *scoring))
+        for _, _, header, sequence in sorted(best_records, reverse=True)
+    ]
+
+
+def __batches(records: Iterable, size: int) -> Iterator[list]:
+    """
+    Groups a stream of records in lists of the given size, the last one may be smaller.
+    :param records: The records.
+    :param size: The size of the batches.
+    :return: The batches.
+    """
+    records = iter(records)
+    batch = list(islice(records, size))
+
+    while batch:
+        yield batch
+        batch = list(islice(records, size))
+
+
+def __set_query(query: str, scoring: Tuple[int, int, int]):
+    """
+    Initializer of the workers of smith_waterman_search, keeps the query and the scoring parameters.
+    :param query: The query sequence.
+    :param scoring: The match score, the mismatch penalty and the gap penalty.
+    """
+    global __worker_query, __worker_scoring
+
+    __worker_query = query
+    __worker_scoring = scoring
+
+
+def __score_sequences(sequences: List[str]) -> List[int]:
+    """
+    Task of the workers of smith_waterman_search, scores a batch of sequences against the query.
+    :param sequences: The sequences.
+    :return: The score of every sequence.
+    """
+    return [smith_waterman_score(__worker_query, sequence, *__worker_scoring)[0] for sequence in sequences]
+
+
+def __rows(codes1: np.ndarray,
+           codes2: np.ndarray,
+           substitution: np.ndarray,
+           gap_penalty: int,
+           local: bool) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Computes the rows of the matrix of an alignment, keeping only the previous row. Every row is vectorized:
+    the cell to the left is a dependency, but H[j] = max(T[j], H[j - 1] + gap) unrolls to
+    H[j] = gap * j + max(T[k] - gap * k) for k <= j, which is a cumulative maximum.
+    :param codes1: The codes of the first sequence.
+    :param codes2: The codes of the second sequence.
+    :param substitution: The score of every pair of codes.
+    :param gap_penalty: The score of a gap.
+    :param local: Whether the alignment is local (Smith-Waterman), otherwise it is global (Needleman-Wunsch).
+    :return: For every row from the first one, the row and the scores from the diagonal and from the cell above.
+    """
+    m = len(codes2)
+    gaps = gap_penalty * np.arange(m + 1, dtype=np.int32)
+    profile = substitution[:, codes2]
+    previous = np.zeros(m + 1, dtype=np.int32) if local else gaps.copy()
+    best = np.empty(m + 1, dtype=np.int32)
+
+    for i, code in enumerate(codes1, 1):
+        diagonal = previous[:-1] + profile[code]
+        up = previous[1:] + gap_penalty
+
+        np.maximum(diagonal, up, out=best[1:])
+        best[0] = 0 if local else gap_penalty * i
+
+        if local:
+            np.maximum(best, 0, out=best)
+
+        row = np.maximum.accumulate(best - gaps) + gaps
+
+        yield row, diagonal, up
+        previous = row
+
+
+def __packed_directions(codes1: np.ndarray,
+                        codes2: np.ndarray,
+                        substitution: np.ndarray,
+                        gap_penalty: int) -> Tuple[int, Tuple[int, int], Callable[[int, int], int]]:
+    """
+    Fills the matrix of Smith-Waterman by rows, storing the direction of every cell in two bits of a byte array.
+    :param codes1: The codes of the first sequence.
+    :param codes2: The codes of the second sequence.
+    :param substitution: The score of every pair of codes.
+    :param gap_penalty: The score of a gap.
+    :return: The maximum score, its first position by rows and a function that returns the direction of a cell.
+    """
+    n, m = len(codes1), len(codes2)
+    row_bytes = (m + 4) // 4
+    packed = bytearray((n + 1) * row_bytes)
+    packed_rows = np.frombuffer(packed, dtype=np.uint8).reshape(n + 1, row_bytes)
+    directions = np.zeros(4 * row_bytes, dtype=np.uint8)
+
+    max_score, position = 0, (0, 0)
+
+    for i, (row, diagonal, up) in enumerate(__rows(codes1, codes2, substitution, gap_penalty, local=True), 1):
+        cells = row[1:]
+        directions[1:m + 1] = TRACEBACK_LEFT
+        directions[1:m + 1][cells == up] = TRACEBACK_UP
+        directions[1:m + 1][cells == diagonal] = TRACEBACK_DIAGONAL
+        directions[1:m + 1][cells == 0] = TRACEBACK_STOP
+
+        # Four cells per byte, the cell j in the bits 2 * (j % 4) of the byte j // 4
+        packed_rows[i] = directions[0::4] | (directions[1::4] << 2) | (directions[2::4] << 4) | (directions[3::4] << 6)
+
+        best = int(row.argmax())
+
+        if row[best] > max_score:
+            max_score, position = int(row[best]), (i, best)
+
+    del packed_rows
+
+    return max_score, position, lambda i, j: (packed[i * row_bytes + (j >> 2)] >> (2 * (j & 3))) & 3
+
+
+def __alignment_start(codes1: np.ndarray,
+                      codes2: np.ndarray,
+                      substitution: np.ndarray,
+                      gap_penalty: int,
+                      max_score: int) -> Tuple[int, int]:
+    """
+    Finds where an optimal local alignment that ends at the end of both sequences starts, aligning the reversed
+    sequences from their start until a cell reaches the maximum score. No alignment scores more than the maximum,
+    so the global alignment between that cell and the end also has the maximum score.
+    :param codes1: The codes of the first sequence up to the end of the alignment.
+    :param codes2: The codes of the second sequence up to the end of the alignment.
+    :param substitution: The score of every pair of codes.
+    :param gap_penalty: The score of a gap.
+    :param max_score: The maximum score.
+    :return: The start (i, j) of the alignment in both sequences.
+    """
+    n, m = len(codes1), len(codes2)
+    rows = __rows(codes1[::-1], codes2[::-1], substitution, gap_penalty, local=False)
+
+    for i, (row, _, _) in enumerate(rows, 1):
+        reached = np.flatnonzero(row == max_score)
+
+        if len(reached):
+            return n - i, m - int(reached[0])
+
+    return n, m
+
+
+def __hirschberg(sequence1: str,
+                 sequence2: str,
+                 codes1: np.ndarray,
+                 codes2: np.ndarray,
+                 substitution: np.ndarray,
+                 gap_penalty: int,
+                 aligned1: List[str],
+                 aligned2: List[str]):
+    """
+    Appends the optimal global alignment of both sequences, computed in linear memory with Hirschberg's algorithm:
+    the first sequence is split in half and the second one where the scores of the left halves, computed forwards,
+    and of the right halves, computed backwards, add up to the maximum. Both halves are then aligned recursively.
+    :param sequence1: The first sequence.
+    :param sequence2: The second sequence.
+    :param codes1: The codes of the first sequence.
+    :param codes2: The codes of the second sequence.
+    :param substitution: The score of every pair of codes.
+    :param gap_penalty: The score of a gap.
+    :param aligned1: The alignment of the first sequence found so far.
+    :param aligned2: The alignment of the second sequence found so far.
+    """
+    n, m = len(sequence1), len(sequence2)
+
+    if n == 0 or m == 0:
+        aligned1.append(sequence1 + "-" * m)
+        aligned2.append("-" * n + sequence2)
+        return
+
+    if n == 1:
+        # The only character is aligned with its best match, or with a gap if that scores more
+        scores = substitution[codes1[0], codes2]
+        best = int(scores.argmax())
+
+        if scores[best] + gap_penalty * (m - 1) >= gap_penalty * (m + 1):
+            aligned1.append("-" * best + sequence1 + "-" * (m - best - 1))
+            aligned2.append(sequence2)
+        else:
+            aligned1.append(sequence1 + "-" * m)
+            aligned2.append("-" + sequence2)
+        return
+
+    middle = n // 2
+    left = __last_row(codes1[:middle], codes2, substitution, gap_penalty)
+    right = __last_row(codes1[middle:][::-1], codes2[::-1], substitution, gap_penalty)
+    split = int((left + right[::-1]).argmax())
+
+    __hirschberg(sequence1[:middle], sequence2[:split], codes1[:middle], codes2[:split],
+                 substitution, gap_penalty, aligned1, aligned2)
+    __hirschberg(sequence1[middle:], sequence2[split:], codes1[middle:], codes2[split:],
+                 substitution, gap_penalty, aligned1, aligned2)
+
+
+def __last_row(codes1: np.ndarray, codes2: np.ndarray, substitution: np.ndarray, gap_penalty: int) -> np.ndarray:
+    """
+    Computes the last row of the matrix of the global alignment keeping only two rows.
+    :param codes1: The codes of the first sequence.
+    :param codes2: The codes of the second sequence.
+    :param substitution: The score of every pair of codes.
+    :param gap_penalty: The score of a gap.
+    :return: The scores of the global alignments between the first sequence and every prefix of the second one.
+    """
+    row = gap_penalty * np.arange(len(codes2) + 1, dtype=np.int32)
+
+    for row, _, _ in __rows(codes1, codes2, substitution, gap_penalty, local=False):
+        pass
+
+    return row
+
+
+def __query_profile(sequence1: str,
+                    sequence2: str,
+                    match_score: int,
+                    mismatch_penalty: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Builds the query profile of the second sequence, with its columns reversed so the cells of an anti-diagonal,
+    whose j decreases as i increases, read consecutive columns.
+    :param sequence1: The first sequence.
+    :param sequence2: The second sequence.
+    :param match_score: The score of a match.
+    :param mismatch_penalty: The score of a mismatch.
+    :return: The code of every character of the first sequence and the profile, where the row of a code and the column
+    m - 1 - j give the score of that character against the character j of the second sequence.
+    """
+    codes1, codes2, alphabet_size = __encode(sequence1, sequence2)
+    profile = __substitution_matrix(alphabet_size, match_score, mismatch_penalty)[:, codes2[::-1]]
+
+    return codes1, np.ascontiguousarray(profile)
+
+
+def __wavefront(sequence1: str,
+                sequence2: str,
+                match_score: int,
+                mismatch_penalty: int,
+                gap_penalty: int) -> Tuple[int, Tuple[int, int], List[Tuple[int, np.ndarray]]]:
+    """
+    Fills the matrix of Smith-Waterman by anti-diagonals, keeping the scores of only the last three of them.
+    The directions of every anti-diagonal are kept for the traceback, which takes O(n * m) bytes.
+    Every anti-diagonal is computed in buffers allocated once, and the maximum score is taken by rows on ties,
+    as in smith_waterman and smith_waterman_score.
+    :param sequence1: The first sequence.
+    :param sequence2: The second sequence.
+    :param match_score: The score of a match.
+    :param mismatch_penalty: The score of a mismatch.
+    :param gap_penalty: The score of a gap.
+    :return: The maximum score, its position and, for every anti-diagonal d, the first row of its cells
+    and their directions.
+    """
+    n, m = len(sequence1), len(sequence2)
+    codes1, profile = __query_profile(sequence1, sequence2, match_score, mismatch_penalty)
+
+    # The scores are between 0 and the best possible alignment, so they are kept in 16 bits when they fit,
+    # which halves the memory read and written for every anti-diagonal
+    bound = max(abs(match_score), abs(mismatch_penalty), abs(gap_penalty)) * (min(n, m) + 2)
+    dtype = np.int16 if bound <= np.iinfo(np.int16).max else np.int32
+
+    # The profile is read as a flat array, the score of the cell (i, j) is at the row of the code of i plus m - j
+    profile = profile.ravel().astype(dtype)
+    rows = codes1 * m + np.arange(len(codes1))
+
+    # The anti-diagonals are indexed by the row i, the cells outside the matrix and in the first row and column are 0
+    diagonals = [np.zeros(n + 1, dtype=dtype) for _ in range(3)]
+    directions = [(0, np.zeros(0, dtype=np.uint8))] * 2
+    max_score, position = 0, (0, 0)
+
+    if n == 0 or m == 0:
+        return max_score, position, directions
+
+    # The directions of all the anti-diagonals are stored one after another in a single array
+    all_directions = np.empty(n * m, dtype=np.uint8)
+    indices = np.empty(n, dtype=np.intp)
+    diagonal_buffer, up_buffer, left_buffer = (np.empty(n, dtype=dtype) for _ in range(3))
+    not_diagonal_buffer, not_up_buffer, not_stop_buffer = (np.empty(n, dtype=bool) for _ in range(3))
+    offset = 0
+
+    for d in range(2, n + m + 1):
+        first, last = max(1, d - m), min(n, d - 1)
+        size = last - first + 1
+        current, previous, before_previous = diagonals[d % 3], diagonals[(d - 1) % 3], diagonals[(d - 2) % 3]
+
+        match = np.add(rows[first - 1:last], m - d + 1, out=indices[:size])
+        diagonal = profile.take(match, out=diagonal_buffer[:size])
+        np.add(diagonal, before_previous[first - 1:last], out=diagonal)
+        up = np.add(previous[first - 1:last], gap_penalty, out=up_buffer[:size])
+        left = np.add(previous[first:last + 1], gap_penalty, out=left_buffer[:size])
+
+        scores = current[first:last + 1]
+        np.maximum(diagonal, up, out=scores)
+        np.maximum(scores, left, out=scores)
+        np.maximum(scores, 0, out=scores)
+
+        # The direction is 1 + (not diagonal) * (1 + not up), that is diagonal, up or left, and 0 if the score is 0
+        not_up = np.not_equal(scores, up, out=not_up_buffer[:size])
+        not_diagonal = np.not_equal(scores, diagonal, out=not_diagonal_buffer[:size])
+        not_stop = np.not_equal(scores, 0, out=not_stop_buffer[:size])
+
+        direction = all_directions[offset:offset + size]
+        np.add(not_up, 1, out=direction, dtype=np.uint8)
+        np.multiply(direction, not_diagonal, out=direction)
+        np.add(direction, 1, out=direction)
+        np.multiply(direction, not_stop, out=direction)
+        directions.append((first, direction))
+        offset += size
+
+        # The first cell of an anti-diagonal with the maximum score has the smallest row
+        best = int(scores.argmax())
+        score, i = int(scores[best]), first + best
+
+        if score > max_score or (score == max_score and score > 0 and i < position[0]):
+            max_score, position = score, (i, d - i)
+
+    return max_score, position, directions
+
+
+def __traceback(sequence1: str, sequence2: str, position: Tuple[int, int], direction) -> Tuple[str, str]:
+    """
+    Recovers the optimal local alignment following the directions from the cell with the maximum score.
+    :param sequence1: The first sequence.
+    :param sequence2: The second sequence.
+    :param position: The position of the maximum score.
+    :param direction: Function that returns the direction of a cell (i, j).
+    :return: The alignment of both sequences, with '-' for the gaps.
+    """
+    aligned1, aligned2 = [], []
+    i, j = position
+
+    while i > 0 and j > 0:
+        move = direction(i, j)
+
+        if move == TRACEBACK_STOP:
+            break
+
+        if move == TRACEBACK_DIAGONAL:
+            aligned1.append(sequence1[i - 1])
+            aligned2.append(sequence2[j - 1])
+            i -= 1
+            j -= 1
+        elif move == TRACEBACK_UP:
+            aligned1.append(sequence1[i - 1])
+            aligned2.append("-")
+            i -= 1
+        else:
+            aligned1.append("-")
+            aligned2.append(sequence2[j - 1])
+            j -= 1
+
+    return "".join(reversed(aligned1)), "".join(reversed(aligned2))
@@ -1,12 +1,15 @@
-from typing import List, Union
+from typing import List, Union, Tuple, Optional
 
 import streamlit as st
 from graphviz import Graph
 
 from config import *
+from utils.markdown_utils import MatrixDelta
 
 IMAGE_SIDEBAR = "resources/sidebar.png"
 
+LAST_RUN_KEY = "last_run"
+
 MENU_ITEMS = {
     "About": "https://github.com/alexfdez1010/streamlit_algorithms",
     "Report a bug": "https://github.com/alexfdez1010/streamlit_algorithms/issues"
@@ -41,7 +44,7 @@ def parameter_input(parameter_name: str, parameter_information: List[Any]) -> An
         raise ValueError(f"Parameter type {parameter_type} is not supported")
 
 
-def render_entry(entry: Union[str, Graph]):
+def render_entry(entry: Union[str, Graph, MatrixDelta]):
     """
     Render an entry of the algorithm
 
@@ -49,20 +52,25 @@ def render_entry(entry: Union[str, Graph]):
     """
     if isinstance(entry, str):
         st.markdown(entry)
+    elif isinstance(entry, MatrixDelta):
+        st.markdown(entry.to_markdown())
+
+        # The full matrix is only reconstructed when it is requested
+        if st.checkbox("Show full table", key=entry.key):
+            st.markdown(entry.full_table())
     else:
         st.graphviz_chart(entry, use_container_width=True)
 
 
-def render_solution(algorithm_function, input_text: str):
+def render_solution(entries: List[Union[str, Graph, MatrixDelta]]):
     """
     Render the solution of the algorithm
 
-    :param algorithm_function: Function to run the algorithm
-    :param input_text: Input of the algorithm
+    :param entries: Entries generated by the algorithm
     """
-    generator_entries = algorithm_function(input_text)
+    generator_entries = iter(entries)
 
-    entry = next(generator_entries)
+    entry = next_wrapper(generator_entries)
 
     while entry:
 
@@ -81,6 +89,45 @@ def render_solution(algorithm_function, input_text: str):
             entry = next_wrapper(generator_entries)
 
 
+def run_algorithm(algorithm_information: Dict[str, Any],
+                  random_generated: bool,
+                  input_text: str,
+                  parameters: Dict[str, Any]) -> Tuple[Optional[List[Union[str, Graph, MatrixDelta]]], Optional[str]]:
+    """
+    Validate the input and run the algorithm over it
+
+    :param algorithm_information: Information of the algorithm
+    :param random_generated: Whether the input has been generated randomly
+    :param input_text: Input of the algorithm
+    :param parameters: Parameters of the random input
+
+    :return: The entries generated by the algorithm, or None and the error message if the input is not valid
+    """
+    function = algorithm_information[FUNCTION]
+
+    algorithm_input = input_text
+
+    if random_generated:
+
+        validation_function = algorithm_information.get(VALIDATION_RANDOM_PARAMETERS_FUNCTION, None)
+        is_correct, message = (True, None) if validation_function is None else validation_function(**parameters)
+
+    else:
+        validation_function = algorithm_information.get(VALIDATION_INPUT_FUNCTION, None)
+        validation_parameters = algorithm_information.get(VALIDATION_PARAMETERS, {})
+
+        # The validation returns the parsed input, so the algorithm does not need to parse it again
+        if validation_function is not None:
+            is_correct, message, algorithm_input = validation_function(input_text, **validation_parameters)
+        else:
+            is_correct, message = True, None
+
+    if not is_correct:
+        return None, message
+
+    return list(function(algorithm_input)), None
+
+
 def is_step(entry: Union[str, Graph]) -> bool:
     """
     Check if an entry is the header of a step
@@ -159,24 +206,23 @@ def main():
     else:
         input_text = st.text_area("Input of the algorithm", height=300)
 
-    if not st.button("Run algorithm"):
-        return
-
-    function = algorithm_information[FUNCTION]
-
-    if random_generated:
+    # The random input is generated again in every rerun, so a random run is identified by its parameters
+    run = (algorithm_selection, random_generated, parameters if random_generated else input_text)
 
-        validation_function = algorithm_information.get(VALIDATION_RANDOM_PARAMETERS_FUNCTION, None)
-        is_correct, message = (True, None) if validation_function is None else validation_function(**parameters)
+    # The entries of the last run are kept, so interacting with the solution renders them again without running
+    # the algorithm, as long as the input has not changed since the run
+    if st.button("Run algorithm"):
+        st.session_state[LAST_RUN_KEY] = (
+            run, run_algorithm(algorithm_information, random_generated, input_text, parameters)
+        )
+    elif st.session_state.get(LAST_RUN_KEY, (None, None))[0] != run:
+        st.session_state.pop(LAST_RUN_KEY, None)
+        return
 
-    else:
-        validation_function = algorithm_information.get(VALIDATION_INPUT_FUNCTION, None)
-        validation_parameters = algorithm_information.get(VALIDATION_PARAMETERS, {})
+    _, (entries, message) = st.session_state[LAST_RUN_KEY]
 
-        is_correct, message = (True, None) \
-            if validation_function is None else validation_function(input_text, **validation_parameters)
-    if is_correct:
-        render_solution(function, input_text)
+    if entries is not None:
+        render_solution(entries)
     else:
         st.error(message)
 
@@ -1,6 +1,7 @@
 from enum import Enum
 from typing import Dict, Any
 
+from algorithms.boruvka import boruvka_algorithm
 from algorithms.dijkstra import dijkstra
 from algorithms.edit_distance import edit_distance
 from algorithms.fibonacci import fibonacci
@@ -61,7 +62,7 @@ The value is a dictionary that contains the following keys:
     - RANDOM_PARAMETERS: the parameters of the random input
     - RANDOM_GENERATE_FUNCTION: the function that generates a random input for the algorithm
     - VALIDATION_PARAMETERS: the parameters of the validation function
-    - VALIDATION_INPUT_FUNCTION: the function that validates the input
+    - VALIDATION_INPUT_FUNCTION: the function that validates the input and returns it parsed for the algorithm
 """
 ALGORITHMS: Dict[str, Dict[str, Dict[str, Any]]] = {
     "Graphs": {
@@ -91,6 +92,19 @@ ALGORITHMS: Dict[str, Dict[str, Dict[str, Any]]] = {
             VALIDATION_PARAMETERS: {"directed": False, "weighted": True},
             VALIDATION_INPUT_FUNCTION: validate_only_one_component,
         },
+        "Borůvka's Algorithm": {
+            DESCRIPTION_FILE: "boruvka.md",
+            FUNCTION: boruvka_algorithm,
+            RANDOM_INPUT_PARAMETERS: {
+                "n": [ParameterType.INT, 3, 20],
+                "m": [ParameterType.INT, 2, 40],
+            },
+            VALIDATION_RANDOM_PARAMETERS_FUNCTION: validate_number_of_edges,
+            RANDOM_PARAMETERS: {"weighted": True, "directed": False},
+            RANDOM_GENERATE_FUNCTION: random_graph_only_one_component,
+            VALIDATION_PARAMETERS: {"directed": False, "weighted": True},
+            VALIDATION_INPUT_FUNCTION: validate_only_one_component,
+        },
         "Floyd-Warshall Algorithm": {
             DESCRIPTION_FILE: "floyd_warshall.md",
             FUNCTION: floyd_warshall,
@@ -114,7 +128,7 @@ ALGORITHMS: Dict[str, Dict[str, Dict[str, Any]]] = {
             VALIDATION_RANDOM_PARAMETERS_FUNCTION: validate_number_of_edges,
             RANDOM_PARAMETERS: {"weighted": True, "directed": False},
             RANDOM_GENERATE_FUNCTION: random_graph_with_source_vertex,
-            VALIDATION_PARAMETERS: {"weighted": True},
+            VALIDATION_PARAMETERS: {"directed": False, "weighted": True},
             VALIDATION_INPUT_FUNCTION: validate_graph_with_source_vertex,
         },
     },
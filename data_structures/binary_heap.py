@@ -0,0 +1,24 @@
+from functools import partial
+from heapq import heappush, heappop
+
+
+class BinaryHeap:
+
+    def __init__(self):
+        """
+        Initialize a binary heap of (key, value) items, the item with the smallest key is popped first.
+        It has the same interface as the other priority queues:
+            - push(item): insert the tuple (key, value).
+            - pop(): remove and return the item with the smallest key, raises IndexError if the heap is empty.
+        Both are bound directly to the heapq functions, so they do not add a Python call per operation.
+        """
+        self._heap = []
+        self.push = partial(heappush, self._heap)
+        self.pop = partial(heappop, self._heap)
+
+    def __len__(self) -> int:
+        """
+        Return the number of items in the heap.
+        :return: number of items
+        """
+        return len(self._heap)
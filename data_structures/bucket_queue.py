@@ -0,0 +1,61 @@
+from typing import Any, Tuple
+
+"""
+Maximum key span for which a bucket queue is used instead of a binary heap. With bigger spans, popping scans too many
+empty buckets, especially in Prim's algorithm, where the keys do not grow monotonically
+"""
+BUCKET_QUEUE_MAX_WEIGHT = 256
+
+
+class BucketQueue:
+
+    def __init__(self, max_key_span: int):
+        """
+        Initialize a bucket queue (Dial's algorithm) for non-negative integer keys. The keys stored at the same time
+        must not differ by more than max_key_span, which holds for Dijkstra's algorithm when max_key_span is the
+        maximum weight and for Prim's algorithm when every key is a weight. There is a circular array of
+        max_key_span + 1 buckets, so the key of an item is its bucket and push and pop do not compare items.
+        :param max_key_span: maximum difference between the keys stored at the same time
+        """
+        self._buckets = [[] for _ in range(max_key_span + 1)]
+        self._cursor = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """
+        Return the number of items in the queue.
+        :return: number of items
+        """
+        return self._size
+
+    def push(self, item: Tuple[int, Any]):
+        """
+        Insert an item in the queue.
+        :param item: tuple (key, value), the key must be an integer, although it can be stored as a float
+        """
+        key = int(item[0])
+
+        if self._size == 0 or key < self._cursor:
+            self._cursor = key
+
+        self._buckets[key % len(self._buckets)].append(item)
+        self._size += 1
+
+    def pop(self) -> Tuple[int, Any]:
+        """
+        Remove and return an item with the smallest key. Raises IndexError if the queue is empty.
+        :return: tuple (key, value)
+        """
+        if self._size == 0:
+            raise IndexError("pop from an empty bucket queue")
+
+        buckets = self._buckets
+        cursor = self._cursor
+
+        while not buckets[cursor % len(buckets)]:
+            cursor += 1
+
+        self._cursor = cursor
+        self._size -= 1
+
+        return buckets[cursor % len(buckets)].pop()
@@ -1,13 +1,23 @@
+from array import array
+from typing import Iterable, List, Optional, Tuple
+
 
 class DisjointSetUnion:
 
-    def __init__(self, n: int):
+    def __init__(self, n: int, rollback: bool = False):
         """
-        Initialize a disjoint set union data structure with n elements.
+        Initialize a disjoint set union data structure with n elements, stored in arrays of C integers.
+        The sets are merged by size and, unless rollback is enabled, the paths are compressed during the finds,
+        so the operations take almost constant amortized time.
+        With rollback enabled the paths are not compressed, which keeps finds in O(log n) because of the union
+        by size, and every union is recorded in a stack so it can be undone.
         :param n: number of elements
+        :param rollback: whether the unions can be undone
         """
-        self._sets = [i for i in range(n)]
-        self._sizes = [1 for i in range(n)]
+        self._sets = array('i', range(n))
+        self._sizes = array('i', [1]) * n
+        self._components = n
+        self._history: Optional[List[Tuple[int, int]]] = [] if rollback else None
 
     def find(self, x: int) -> int:
         """
@@ -15,30 +25,88 @@ class DisjointSetUnion:
         :param x: element
         :return: representative element of the set containing x
         """
-        if self._sets[x] == x:
-            return x
+        sets = self._sets
+        root = x
+
+        while sets[root] != root:
+            root = sets[root]
+
+        if self._history is None:
+            while sets[x] != root:
+                sets[x], x = root, sets[x]
+
+        return root
 
-        return self.find(self._sets[x])
+    def find_many(self, elements: Iterable[int]) -> List[int]:
+        """
+        Find the representative elements of the sets containing the given elements.
+        :param elements: elements
+        :return: representative elements of the sets containing each element
+        """
+        return list(map(self.find, elements))
 
-    def union(self, x: int, y: int):
+    def union(self, x: int, y: int) -> bool:
         """
         Merge the sets containing x and y. If x and y are already in the same set, does nothing.
         :param x: element
         :param y: element
+        :return: whether the sets have been merged
         """
         x = self.find(x)
         y = self.find(y)
 
         if x == y:
-            return
+            return False
 
         if self._sizes[x] < self._sizes[y]:
-            self._sets[x] = y
-            self._sizes[y] += self._sizes[x]
+            x, y = y, x
+
+        self._sets[y] = x
+        self._sizes[x] += self._sizes[y]
+        self._components -= 1
+
+        if self._history is not None:
+            self._history.append((x, y))
+
+        return True
+
+    def union_many(self, pairs: Iterable[Tuple[int, int]]) -> int:
+        """
+        Merge the sets containing each pair of elements.
+        :param pairs: pairs of elements
+        :return: number of merges done, the pairs already in the same set are not counted
+        """
+        return sum(self.union(x, y) for x, y in pairs)
+
+    def checkpoint(self) -> int:
+        """
+        Return a checkpoint of the current state to roll back to it later. Requires rollback to be enabled.
+        :return: checkpoint, the number of unions done
+        """
+        if self._history is None:
+            raise ValueError("The disjoint set union has not been created with rollback enabled")
 
-        else:
-            self._sets[y] = x
-            self._sizes[x] += self._sizes[y]
+        return len(self._history)
+
+    def rollback(self, checkpoint: Optional[int] = None):
+        """
+        Undo the unions done after a checkpoint, or only the last union if no checkpoint is given.
+        If there are no unions to undo, does nothing. Requires rollback to be enabled.
+        :param checkpoint: checkpoint returned by the method checkpoint
+        """
+        if self._history is None:
+            raise ValueError("The disjoint set union has not been created with rollback enabled")
+
+        if checkpoint is None:
+            checkpoint = len(self._history) - 1
+
+        checkpoint = max(checkpoint, 0)
+
+        while len(self._history) > checkpoint:
+            x, y = self._history.pop()
+            self._sets[y] = y
+            self._sizes[x] -= self._sizes[y]
+            self._components += 1
 
     def size(self):
         """
@@ -48,6 +116,23 @@ class DisjointSetUnion:
         """
         return len(self._sets)
 
+    def set_size(self, x: int) -> int:
+        """
+        Return the number of elements in the set containing x.
+        :param x: element
+        :return: number of elements in the set
+        """
+        return self._sizes[self.find(x)]
+
+    @property
+    def components(self) -> int:
+        """
+        Return the number of disjoint sets.
+
+        :return: number of sets
+        """
+        return self._components
+
     @property
     def sets(self):
         """
@@ -55,4 +140,4 @@ class DisjointSetUnion:
 
         :return: sets
         """
-        return self._sets
\ No newline at end of file
+        return self._sets
@@ -0,0 +1,148 @@
+from array import array
+from typing import Tuple
+
+
+class IndexedHeap:
+
+    def __init__(self, n: int):
+        """
+        Initialize an indexed binary heap whose values are the integers from 0 to n - 1, each one stored at most once.
+        The position of every value in the heap is kept, so its key can be decreased in place instead of pushing
+        a new item, and the heap never holds more than n items.
+        It has the same interface as the other priority queues:
+            - push(item): insert the tuple (key, value), or decrease the key of the value if it is already stored.
+            - pop(): remove and return the item with the smallest key, raises IndexError if the heap is empty.
+        :param n: number of possible values
+        """
+        self._heap = array('i')
+        self._positions = array('i', [-1]) * n
+        self._keys = array('d', [0.0]) * n
+
+    def __len__(self) -> int:
+        """
+        Return the number of items in the heap.
+        :return: number of items
+        """
+        return len(self._heap)
+
+    def __contains__(self, value: int) -> bool:
+        """
+        Check if a value is stored in the heap.
+        :param value: value
+        :return: whether the value is stored
+        """
+        return self._positions[value] != -1
+
+    def key(self, value: int) -> float:
+        """
+        Return the key of a value stored in the heap.
+        :param value: value stored in the heap
+        :return: key of the value
+        """
+        return self._keys[value]
+
+    def push(self, item: Tuple[float, int]) -> bool:
+        """
+        Insert an item in the heap. If the value is already stored, its key is decreased if the new key is smaller.
+        :param item: tuple (key, value)
+        :return: whether the heap has changed
+        """
+        key, value = item
+
+        if self._positions[value] == -1:
+            self._heap.append(value)
+            self._positions[value] = len(self._heap) - 1
+
+        elif key >= self._keys[value]:
+            return False
+
+        self._keys[value] = key
+        self._sift_up(self._positions[value])
+
+        return True
+
+    def decrease_key(self, value: int, key: float):
+        """
+        Decrease the key of a value stored in the heap.
+        :param value: value stored in the heap
+        :param key: new key, not greater than the current one
+        """
+        if self._positions[value] == -1:
+            raise KeyError(f"{value} is not in the heap")
+
+        if key > self._keys[value]:
+            raise ValueError(f"The new key {key} is greater than the current key {self._keys[value]}")
+
+        self._keys[value] = key
+        self._sift_up(self._positions[value])
+
+    def pop(self) -> Tuple[float, int]:
+        """
+        Remove and return the item with the smallest key. Raises IndexError if the heap is empty.
+        :return: tuple (key, value)
+        """
+        if not self._heap:
+            raise IndexError("pop from an empty indexed heap")
+
+        heap = self._heap
+        value = heap[0]
+        last = heap.pop()
+        self._positions[value] = -1
+
+        if heap:
+            heap[0] = last
+            self._positions[last] = 0
+            self._sift_down(0)
+
+        return self._keys[value], value
+
+    def _sift_up(self, position: int):
+        """
+        Move the value at a position up until its parent has a smaller or equal key.
+        :param position: position in the heap
+        """
+        heap, positions, keys = self._heap, self._positions, self._keys
+        value = heap[position]
+        key = keys[value]
+
+        while position > 0:
+            parent = (position - 1) >> 1
+
+            if keys[heap[parent]] <= key:
+                break
+
+            heap[position] = heap[parent]
+            positions[heap[position]] = position
+            position = parent
+
+        heap[position] = value
+        positions[value] = position
+
+    def _sift_down(self, position: int):
+        """
+        Move the value at a position down until its children have greater or equal keys.
+        :param position: position in the heap
+        """
+        heap, positions, keys = self._heap, self._positions, self._keys
+        value = heap[position]
+        key = keys[value]
+        size = len(heap)
+
+        while True:
+            child = 2 * position + 1
+
+            if child >= size:
+                break
+
+            if child + 1 < size and keys[heap[child + 1]] < keys[heap[child]]:
+                child += 1
+
+            if keys[heap[child]] >= key:
+                break
+
+            heap[position] = heap[child]
+            positions[heap[position]] = position
+            position = child
+
+        heap[position] = value
+        positions[value] = position
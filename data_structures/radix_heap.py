@@ -0,0 +1,60 @@
+from typing import Any, Tuple
+
+RADIX_HEAP_BUCKETS = 65
+
+
+class RadixHeap:
+
+    def __init__(self):
+        """
+        Initialize a radix heap for non-negative integer keys up to 2^64. It is a monotone priority queue: a key
+        pushed can not be smaller than the last key popped, which holds for Dijkstra's algorithm. The item with
+        key k is stored in the bucket given by the highest bit in which k differs from the last key popped,
+        so every item moves at most 64 times between buckets in total.
+        """
+        self._buckets = [[] for _ in range(RADIX_HEAP_BUCKETS)]
+        self._last = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """
+        Return the number of items in the heap.
+        :return: number of items
+        """
+        return self._size
+
+    def push(self, item: Tuple[int, Any]):
+        """
+        Insert an item in the heap.
+        :param item: tuple (key, value), the key must be an integer not smaller than the last key popped,
+        although it can be stored as a float
+        """
+        self._buckets[(int(item[0]) ^ self._last).bit_length()].append(item)
+        self._size += 1
+
+    def pop(self) -> Tuple[int, Any]:
+        """
+        Remove and return an item with the smallest key. Raises IndexError if the heap is empty.
+        :return: tuple (key, value)
+        """
+        if self._size == 0:
+            raise IndexError("pop from an empty radix heap")
+
+        buckets = self._buckets
+
+        if not buckets[0]:
+            index = 1
+            while not buckets[index]:
+                index += 1
+
+            # All the items of the first non-empty bucket are redistributed to lower buckets around its minimum
+            items = buckets[index]
+            buckets[index] = []
+            self._last = last = int(min(key for key, _ in items))
+
+            for item in items:
+                buckets[(int(item[0]) ^ last).bit_length()].append(item)
+
+        self._size -= 1
+
+        return buckets[0].pop()
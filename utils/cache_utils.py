@@ -0,0 +1,133 @@
+import sys
+from array import array
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable, Optional
+
+SHORTEST_PATH_CACHE_BYTES = 64 * 1024 * 1024
+
+
+class LRUCache:
+
+    def __init__(self, max_bytes: int):
+        """
+        Initialize a least recently used cache limited by the memory of the values stored.
+        When a new value does not fit, the least recently used values are evicted.
+        :param max_bytes: maximum number of bytes of the values stored
+        """
+        self._entries = OrderedDict()
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        """
+        Return the number of values stored.
+        :return: number of values
+        """
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    @property
+    def bytes(self) -> int:
+        """
+        Return the number of bytes of the values stored.
+        :return: number of bytes
+        """
+        return self._bytes
+
+    @property
+    def max_bytes(self) -> int:
+        """
+        Return the maximum number of bytes of the values stored.
+        :return: maximum number of bytes
+        """
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes: int):
+        """
+        Change the maximum number of bytes of the values stored, evicting values if they do not fit anymore.
+        :param max_bytes: maximum number of bytes
+        """
+        with self._lock:
+            self._max_bytes = max_bytes
+            self._evict(0)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Return the value stored for the key and mark it as the most recently used.
+        :param key: key of the value
+        :return: the value, or None if it is not stored
+        """
+        with self._lock:
+            if key not in self._entries:
+                return None
+
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key: Hashable, value: Any):
+        """
+        Store a value for the key as the most recently used. Values bigger than the whole cache are not stored.
+        :param key: key of the value
+        :param value: the value
+        """
+        size = size_in_bytes(value)
+
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+
+            if size > self._max_bytes:
+                return
+
+            self._evict(size)
+            self._entries[key] = (value, size)
+            self._bytes += size
+
+    def clear(self):
+        """
+        Remove all the values stored.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _evict(self, size: int):
+        """
+        Evict the least recently used values until a value of the given size fits.
+        :param size: number of bytes to make room for
+        """
+        while self._entries and self._bytes + size > self._max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+
+
+def size_in_bytes(value: Any) -> int:
+    """
+    Estimate the memory used by a value, following tuples and lists and counting the buffer of arrays.
+    :param value: the value
+    :return: number of bytes
+    """
+    if isinstance(value, array):
+        return sys.getsizeof(value)
+
+    if hasattr(value, "nbytes"):
+        return value.nbytes
+
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(size_in_bytes(item) for item in value)
+
+    return sys.getsizeof(value)
+
+
+"""
+Cache shared by the shortest path algorithms, the keys are tuples (algorithm, graph fingerprint, source).
+It is used by the engines that only return the result, cached_dijkstra_solve and cached_floyd_warshall_solve.
+The step-by-step resolutions of the app are not served from it, as they narrate every relaxation and a stored
+result can not replace them; the app keeps the entries of its last run instead.
+"""
+shortest_path_cache = LRUCache(SHORTEST_PATH_CACHE_BYTES)
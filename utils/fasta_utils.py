@@ -0,0 +1,30 @@
+from typing import Iterator, Tuple, List
+
+
+def read_fasta(path: str) -> Iterator[Tuple[str, str]]:
+    """
+    Reads the records of a FASTA file one by one, so only one record is kept in memory at a time.
+    Every record starts with a line beginning with '>' followed by its description, and the next lines until
+    the next record are its sequence.
+    :param path: The path of the FASTA file.
+    :return: The description and the sequence of every record, in order.
+    """
+    header = None
+    lines: List[str] = []
+
+    with open(path, "r") as file:
+        for line in file:
+            line = line.strip()
+
+            if line.startswith(">"):
+                if header is not None:
+                    yield header, "".join(lines)
+
+                header = line[1:].strip()
+                lines = []
+
+            elif line and header is not None:
+                lines.append(line)
+
+    if header is not None:
+        yield header, "".join(lines)
@@ -1,4 +1,370 @@
-from typing import List, Tuple, Union, Optional
+import hashlib
+import mmap
+import os
+import re
+import struct
+import sys
+import warnings
+from array import array
+from enum import Enum
+from itertools import compress, repeat
+from operator import sub
+from typing import List, Tuple, Union, Optional, Iterable, Iterator, Sequence
+
+import numpy as np
+
+GRAPH_FILE_CHUNK_SIZE = 1 << 23
+
+GRAPH_BINARY_MAGIC = b"GRAPHBIN"
+GRAPH_BINARY_VERSION = 1
+GRAPH_BINARY_HEADER = struct.Struct("<8sHBB4xqq")
+
+EDGE_LIST_HEADER = re.compile(rb"\s*(\d+)[ \t]+(\d+)")
+DIMACS_PROBLEM = re.compile(rb"^p[ \t]+\S+[ \t]+(\d+)[ \t]+(\d+)", re.MULTILINE)
+DIMACS_ARC = re.compile(rb"^a[ \t]+(\d+)[ \t]+(\d+)[ \t]+(\S+)", re.MULTILINE)
+MATRIX_MARKET_HEADER = re.compile(rb"%%MatrixMarket[ \t]+matrix[ \t]+(\w+)[ \t]+(\w+)[ \t]+(\w+)", re.IGNORECASE)
+MATRIX_MARKET_SIZE = re.compile(rb"^[ \t]*(\d+)[ \t]+(\d+)[ \t]+(\d+)", re.MULTILINE)
+MATRIX_MARKET_ENTRY = re.compile(rb"^[ \t]*(\d+)[ \t]+(\d+)(?:[ \t]+([^\s]+))?", re.MULTILINE)
+
+
+class GraphFileFormat(Enum):
+    """
+    Enum for the formats of the graph files
+    """
+
+    EDGE_LIST = "edge_list"
+    DIMACS = "dimacs"
+    MATRIX_MARKET = "matrix_market"
+
+
+class ParsedGraph:
+
+    def __init__(self,
+                 n: int,
+                 edges: List[Union[Tuple[int, int], Tuple[int, int, float]]],
+                 adjacency: Union[List[List[int]], List[List[Tuple[int, float]]]],
+                 directed: bool = True,
+                 weighted: bool = True,
+                 source: Optional[int] = None,
+                 target: Optional[int] = None):
+        """
+        Graph parsed once from its string representation, shared by the validations and the algorithms.
+        For undirected graphs every edge is stored only once with its smaller endpoint first.
+        :param n: The number of nodes.
+        :param edges: The list of edges of the graph, or a view over them.
+        :param adjacency: The adjacency list representation of the graph, or a CSR graph.
+        :param directed: Whether the graph is directed or not.
+        :param weighted: Whether the graph is weighted or not.
+        :param source: The source vertex, if the input defines one.
+        :param target: The target vertex, if the input defines one.
+        """
+        self.n = n
+        self.m = len(edges)
+        self.edges = edges
+        self.adjacency = adjacency
+        self.directed = directed
+        self.weighted = weighted
+        self.source = source
+        self.target = target
+
+        # Computed once by max_integer_weight, -1 until then, as the graph is not modified after it is built
+        self._max_integer_weight: Optional[int] = -1
+
+        # Computed once by graph_fingerprint, None until then
+        self._fingerprint: Optional[str] = None
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, u: int) -> Union[List[int], List[Tuple[int, float]]]:
+        return self.adjacency[u]
+
+
+class NeighbourView:
+
+    def __init__(self, targets: memoryview, weights: memoryview):
+        """
+        Zero-copy view over the neighbours of a node of a CSR graph.
+        :param targets: The slice of the targets of the node.
+        :param weights: The slice of the weights of the node.
+        """
+        self._targets = targets
+        self._weights = weights
+
+    def __len__(self) -> int:
+        return len(self._targets)
+
+    def __iter__(self) -> Iterator[Tuple[int, float]]:
+        return zip(self._targets, self._weights)
+
+    @property
+    def targets(self) -> memoryview:
+        return self._targets
+
+    @property
+    def weights(self) -> memoryview:
+        return self._weights
+
+
+class EdgeListView:
+
+    def __init__(self, graph: "CSRGraph"):
+        """
+        Zero-copy view over the edges of a CSR graph, following the same convention as ParsedGraph.edges:
+        the edges of an undirected graph are only listed once with its smaller endpoint first.
+        :param graph: The CSR graph.
+        """
+        self._graph = graph
+
+    def __len__(self) -> int:
+        return self._graph.m
+
+    def __iter__(self) -> Iterator[Tuple[int, int, float]]:
+        offsets, targets, weights = self._graph.offsets, self._graph.targets, self._graph.weights
+        directed = self._graph.directed
+
+        for u in range(self._graph.n):
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                if directed or u < v:
+                    yield u, v, weights[i]
+
+
+class CSRGraph:
+
+    def __init__(self,
+                 n: int,
+                 offsets: Sequence[int],
+                 targets: Sequence[int],
+                 weights: Sequence[float],
+                 directed: bool = True,
+                 m: Optional[int] = None):
+        """
+        Weighted graph in compressed sparse row format. The arcs leaving the node u are stored
+        in targets[offsets[u]:offsets[u + 1]] and their weights in the same positions of weights.
+        Undirected graphs store every edge in both directions.
+        :param n: The number of nodes.
+        :param offsets: The n + 1 offsets of the nodes, usually an array('i').
+        :param targets: The target of every arc, usually an array('i').
+        :param weights: The weight of every arc, usually an array('d').
+        :param directed: Whether the graph is directed or not.
+        :param m: The number of edges, by default deduced from the number of arcs.
+        """
+        self.n = n
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.directed = directed
+
+        if m is None:
+            m = len(targets) if directed else len(targets) // 2
+
+        self.m = m
+
+        # Computed once by max_integer_weight, -1 until then, as the graph is not modified after it is built
+        self._max_integer_weight: Optional[int] = -1
+
+        # Computed once by graph_fingerprint, None until then
+        self._fingerprint: Optional[str] = None
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, u: int) -> NeighbourView:
+        return self.neighbours(u)
+
+    def neighbours(self, u: int) -> NeighbourView:
+        """
+        Returns a zero-copy view over the neighbours of u and the weights of the arcs to them.
+        :param u: The node.
+        :return: The view over the neighbours of u.
+        """
+        start, end = self.offsets[u], self.offsets[u + 1]
+        return NeighbourView(memoryview(self.targets)[start:end], memoryview(self.weights)[start:end])
+
+    def degree(self, u: int) -> int:
+        """
+        Returns the number of arcs leaving u.
+        :param u: The node.
+        :return: The degree of u.
+        """
+        return self.offsets[u + 1] - self.offsets[u]
+
+    def edges(self) -> EdgeListView:
+        """
+        Returns a zero-copy view over the edges of the graph.
+        :return: The view over the edges.
+        """
+        return EdgeListView(self)
+
+
+def arrays_to_csr_graph(n: int,
+                        sources: Sequence[int],
+                        targets: Sequence[int],
+                        weights: Sequence[float],
+                        directed: bool = True) -> CSRGraph:
+    """
+    Builds a CSR graph from the parallel arrays of an edge list using a counting sort by source node.
+    :param n: The number of nodes.
+    :param sources: The source of every edge.
+    :param targets: The target of every edge.
+    :param weights: The weight of every edge.
+    :param directed: Whether the graph is directed or not.
+    :return: The CSR graph.
+    """
+    m = len(sources)
+    arcs = m if directed else 2 * m
+
+    offsets = array("i", bytes(4 * (n + 1)))
+
+    for u in sources:
+        offsets[u + 1] += 1
+
+    if not directed:
+        for v in targets:
+            offsets[v + 1] += 1
+
+    for u in range(n):
+        offsets[u + 1] += offsets[u]
+
+    position = array("i", offsets)
+    csr_targets = array("i", bytes(4 * arcs))
+    csr_weights = array("d", bytes(8 * arcs))
+
+    for u, v, w in zip(sources, targets, weights):
+        i = position[u]
+        csr_targets[i] = v
+        csr_weights[i] = w
+        position[u] = i + 1
+
+        if not directed:
+            i = position[v]
+            csr_targets[i] = u
+            csr_weights[i] = w
+            position[v] = i + 1
+
+    return CSRGraph(n, offsets, csr_targets, csr_weights, directed, m)
+
+
+def edges_to_csr_graph(n: int,
+                       edges: Iterable[Union[Tuple[int, int], Tuple[int, int, float]]],
+                       directed: bool = True) -> CSRGraph:
+    """
+    Builds a CSR graph from a list of edges. Edges without weight get a weight of 1.
+    :param n: The number of nodes.
+    :param edges: The edges of the graph.
+    :param directed: Whether the graph is directed or not.
+    :return: The CSR graph.
+    """
+    sources, targets, weights = array("i"), array("i"), array("d")
+
+    for edge in edges:
+        sources.append(edge[0])
+        targets.append(edge[1])
+        weights.append(edge[2] if len(edge) > 2 else 1.0)
+
+    return arrays_to_csr_graph(n, sources, targets, weights, directed)
+
+
+def edges_to_parsed_graph(n: int,
+                          edges: List[Union[Tuple[int, int], Tuple[int, int, float]]],
+                          directed: bool = True,
+                          weighted: bool = True) -> ParsedGraph:
+    """
+    Builds a parsed graph from a list of edges, filling the adjacency list in the same pass.
+    :param n: The number of nodes.
+    :param edges: The list of edges of the graph.
+    :param directed: Whether the graph is directed or not.
+    :param weighted: Whether the graph is weighted or not.
+    :return: The parsed graph.
+    """
+    adjacency = [[] for _ in range(n)]
+    graph_edges = []
+
+    for edge in edges:
+        u, v = edge[0], edge[1]
+
+        if weighted:
+            adjacency[u].append((v, edge[2]))
+            if not directed:
+                adjacency[v].append((u, edge[2]))
+        else:
+            adjacency[u].append(v)
+            if not directed:
+                adjacency[v].append(u)
+
+        if not directed and u > v:
+            edge = (v, u) + tuple(edge[2:])
+
+        graph_edges.append(edge)
+
+    return ParsedGraph(n, graph_edges, adjacency, directed, weighted)
+
+
+def parse_graph(input_string: str,
+                directed: bool = True,
+                weighted: bool = True,
+                source_vertex: bool = False) -> ParsedGraph:
+    """
+    Parses the string representation of a graph in a single pass.
+    :param input_string: The string representation of the graph.
+    :param directed: Whether the graph is directed or not.
+    :param weighted: Whether the graph is weighted or not.
+    :param source_vertex: Whether the line after the edges contains the source vertex,
+    optionally followed by a line with the target vertex.
+    :return: The parsed graph.
+    """
+    lines = input_string.splitlines()
+
+    n, m = map(int, lines[0].split())
+    edges = []
+
+    for line in lines[1:m + 1]:
+        if weighted:
+            u, v, w = line.split()
+            edges.append((int(u), int(v), float(w)))
+        else:
+            u, v = line.split()
+            edges.append((int(u), int(v)))
+
+    graph = edges_to_parsed_graph(n, edges, directed, weighted)
+
+    if source_vertex:
+        graph.source = int(lines[m + 1])
+
+        if len(lines) > m + 2 and lines[m + 2].strip():
+            graph.target = int(lines[m + 2])
+
+    return graph
+
+
+def as_parsed_graph(input_graph: Union[str, ParsedGraph, CSRGraph],
+                    directed: bool = True,
+                    weighted: bool = True,
+                    source_vertex: bool = False) -> ParsedGraph:
+    """
+    Returns the parsed graph, parsing the input only if it is still a string.
+    A CSR graph is wrapped without copying, its views are used as the edges and the adjacency.
+    A graph already parsed or in CSR format keeps its own directedness. An undirected graph is also accepted
+    when a directed one is asked for, as its adjacency holds every edge in both directions even though its edges
+    are listed once, but a directed graph can not be used where an undirected one is needed.
+    :param input_graph: The string representation of the graph, the graph already parsed or a CSR graph.
+    :param directed: Whether the graph is directed or not.
+    :param weighted: Whether the graph is weighted or not.
+    :param source_vertex: Whether the line after the edges contains the source vertex,
+    optionally followed by a line with the target vertex.
+    :return: The parsed graph.
+    """
+    if isinstance(input_graph, (ParsedGraph, CSRGraph)) and input_graph.directed and not directed:
+        raise ValueError("The graph is directed, but an undirected graph is needed")
+
+    if isinstance(input_graph, ParsedGraph):
+        return input_graph
+
+    if isinstance(input_graph, CSRGraph):
+        return ParsedGraph(input_graph.n, input_graph.edges(), input_graph, input_graph.directed, weighted=True)
+
+    return parse_graph(input_graph, directed, weighted, source_vertex)
 
 
 def input_to_adjacency_list(input_string: str,
@@ -111,3 +477,495 @@ def adjacency_list_to_list_of_edges(adjacency_list: List[List[Union[int, Tuple[i
             else:
                 edges.append((u, v))
     return edges
+
+
+def as_csr_graph(input_graph: Union[str, ParsedGraph, CSRGraph],
+                 directed: bool = True,
+                 weighted: bool = True) -> CSRGraph:
+    """
+    Returns the graph in CSR format, converting it only if it is not already.
+    A graph already parsed or in CSR format keeps its own directedness.
+    :param input_graph: The string representation of the graph, the graph already parsed or a CSR graph.
+    :param directed: Whether the graph is directed or not, if it is parsed from a string.
+    :param weighted: Whether the graph is weighted or not, if it is parsed from a string.
+    :return: The CSR graph.
+    """
+    if isinstance(input_graph, CSRGraph):
+        return input_graph
+
+    if isinstance(input_graph, ParsedGraph) and isinstance(input_graph.adjacency, CSRGraph):
+        return input_graph.adjacency
+
+    graph = input_graph if isinstance(input_graph, ParsedGraph) else parse_graph(input_graph, directed, weighted)
+
+    return edges_to_csr_graph(graph.n, graph.edges, graph.directed)
+
+
+def graph_fingerprint(graph: Union[ParsedGraph, CSRGraph]) -> str:
+    """
+    Computes a stable hash of the structure of a weighted graph: the number of nodes, whether it is directed and
+    its edges with their weights. The same graph in the same representation always gets the same fingerprint,
+    also between different processes and runs. The source and target vertices are not part of it.
+    It is only computed the first time, the result is kept in the graph, so the lookups of a cache cost nothing.
+    :param graph: The graph, either parsed or in CSR format.
+    :return: The hexadecimal fingerprint.
+    """
+    if isinstance(graph, ParsedGraph) and isinstance(graph.adjacency, CSRGraph):
+        graph = graph.adjacency
+
+    if graph._fingerprint is None:
+        graph._fingerprint = __compute_fingerprint(graph)
+
+    return graph._fingerprint
+
+
+def max_integer_weight(graph: Union[ParsedGraph, CSRGraph]) -> Optional[int]:
+    """
+    Returns the maximum weight of the graph if all the weights are non-negative integers.
+    The weights are only scanned the first time, the result is kept in the graph.
+    :param graph: The graph, either parsed or in CSR format.
+    :return: The maximum weight, or None if any weight is negative or not an integer.
+    """
+    if isinstance(graph, ParsedGraph) and isinstance(graph.adjacency, CSRGraph):
+        graph = graph.adjacency
+
+    if graph._max_integer_weight != -1:
+        return graph._max_integer_weight
+
+    if isinstance(graph, CSRGraph):
+        weights = graph.weights
+    else:
+        weights = [float(edge[2]) for edge in graph.edges]
+
+    if len(weights) == 0:
+        graph._max_integer_weight = 0
+    elif min(weights) < 0 or not all(map(float.is_integer, weights)):
+        graph._max_integer_weight = None
+    else:
+        graph._max_integer_weight = int(max(weights))
+
+    return graph._max_integer_weight
+
+
+def reverse_graph(graph: Union[ParsedGraph, CSRGraph]) -> Union[ParsedGraph, CSRGraph]:
+    """
+    Returns the graph with all its edges reversed, in the same representation.
+    Undirected graphs are their own reverse, so they are returned without copying.
+    :param graph: The graph, either parsed or in CSR format.
+    :return: The reversed graph.
+    """
+    if not graph.directed:
+        return graph
+
+    if isinstance(graph, CSRGraph):
+        sources, targets, weights = array("i"), array("i"), array("d")
+
+        for u, v, w in graph.edges():
+            sources.append(v)
+            targets.append(u)
+            weights.append(w)
+
+        return arrays_to_csr_graph(graph.n, sources, targets, weights, directed=True)
+
+    return edges_to_parsed_graph(graph.n, [(edge[1], edge[0]) + tuple(edge[2:]) for edge in graph.edges],
+                                 directed=True, weighted=graph.weighted)
+
+
+def load_graph_file(path: str,
+                    directed: bool = True,
+                    weighted: bool = True,
+                    file_format: Optional[GraphFileFormat] = None) -> CSRGraph:
+    """
+    Loads a graph from a file into a CSR graph. The file is memory-mapped and the edges are parsed straight
+    from the mapped buffer in bounded chunks of lines, so no string is built for every line. Self-loops are discarded.
+    The supported formats are:
+        - EDGE_LIST: the format of the text inputs, "n m" followed by m lines "u v w" (0-indexed).
+        - DIMACS: the shortest path challenge format (.gr), "p sp n m" and arcs "a u v w" (1-indexed).
+        - MATRIX_MARKET: coordinate Matrix Market files (.mtx), symmetric matrices are loaded as undirected graphs.
+    :param path: The path of the file.
+    :param directed: Whether the graph is directed or not.
+    :param weighted: Whether the weights of the file are read, if not every edge gets a weight of 1.
+    Unweighted edge list files contain only "u v" in every line.
+    :param file_format: The format of the file, by default deduced from its extension.
+    :return: The CSR graph.
+    """
+    if file_format is None:
+        file_format = graph_file_format(path)
+
+    if os.path.getsize(path) == 0:
+        raise ValueError(f"The graph file {path} cannot be empty")
+
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+
+        if file_format == GraphFileFormat.EDGE_LIST:
+            n, edge_list = __read_edge_list(buffer, weighted)
+        elif file_format == GraphFileFormat.DIMACS:
+            n, edge_list = __read_dimacs(buffer, weighted)
+        elif file_format == GraphFileFormat.MATRIX_MARKET:
+            n, edge_list, symmetric = __read_matrix_market(buffer, weighted)
+            directed = directed and not symmetric
+        else:
+            raise ValueError(f"Graph file format {file_format} is not supported")
+
+    return arrays_to_csr_graph(n, *edge_list, directed=directed)
+
+
+def save_binary_graph(graph: Union[ParsedGraph, CSRGraph], path: str, with_csr: bool = True):
+    """
+    Saves a weighted graph in the binary graph format, so it can be loaded again without parsing any text.
+    The file contains a header followed by packed arrays in little-endian byte order:
+        - Header: magic "GRAPHBIN", version (uint16), directed (uint8), has CSR (uint8), padding, n and m (int64).
+        - The sources and the targets of the m edges (int32) and their weights (float64).
+        - Optionally the CSR index: the weights of the arcs (float64), the n + 1 offsets and the targets (int32).
+    :param graph: The graph, either parsed or in CSR format.
+    :param path: The path of the file.
+    :param with_csr: Whether the CSR index is also stored, so loading does not need to build it.
+    """
+    edges = graph.edges() if isinstance(graph, CSRGraph) else graph.edges
+    sources, targets, weights = array("i"), array("i"), array("d")
+
+    for u, v, w in edges:
+        sources.append(u)
+        targets.append(v)
+        weights.append(w)
+
+    csr_graph = None
+
+    if with_csr:
+        if isinstance(graph, CSRGraph):
+            csr_graph = graph
+        else:
+            csr_graph = arrays_to_csr_graph(graph.n, sources, targets, weights, graph.directed)
+
+    with open(path, "wb") as file:
+        file.write(GRAPH_BINARY_HEADER.pack(
+            GRAPH_BINARY_MAGIC, GRAPH_BINARY_VERSION, graph.directed, with_csr, graph.n, len(sources)
+        ))
+
+        arrays = [sources, targets, weights]
+
+        if csr_graph is not None:
+            arrays += [array("d", csr_graph.weights), array("i", csr_graph.offsets), array("i", csr_graph.targets)]
+
+        for values in arrays:
+            if sys.byteorder != "little":
+                values = array(values.typecode, values)
+                values.byteswap()
+
+            file.write(values)
+
+
+def load_binary_graph(path: str, use_mmap: bool = True) -> CSRGraph:
+    """
+    Loads a graph saved in the binary graph format. With the memory map, if the file contains the CSR index,
+    the graph works directly over the mapped file without copying it, otherwise the arrays are read with
+    a single copy each.
+    :param path: The path of the file.
+    :param use_mmap: Whether the file is memory-mapped or read into memory.
+    :return: The CSR graph.
+    """
+    with open(path, "rb") as file:
+        if use_mmap and sys.byteorder == "little":
+            buffer = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+        else:
+            buffer = memoryview(file.read())
+
+    if len(buffer) < GRAPH_BINARY_HEADER.size:
+        raise ValueError(f"The file {path} is not a binary graph file")
+
+    magic, version, directed, has_csr, n, m = GRAPH_BINARY_HEADER.unpack_from(buffer)
+
+    if magic != GRAPH_BINARY_MAGIC:
+        raise ValueError(f"The file {path} is not a binary graph file")
+
+    if version != GRAPH_BINARY_VERSION:
+        raise ValueError(f"The version {version} of the binary graph file {path} is not supported")
+
+    arcs = m if directed else 2 * m
+    position = GRAPH_BINARY_HEADER.size
+
+    def read_array(typecode: str, length: int) -> Sequence:
+        nonlocal position
+        size = length * (8 if typecode == "d" else 4)
+
+        if position + size > len(buffer):
+            raise ValueError(f"The binary graph file {path} is truncated")
+
+        values = buffer[position:position + size].cast(typecode)
+        position += size
+
+        if sys.byteorder != "little":
+            values = array(typecode, values)
+            values.byteswap()
+
+        return values
+
+    sources, targets, weights = read_array("i", m), read_array("i", m), read_array("d", m)
+
+    if not has_csr:
+        return arrays_to_csr_graph(n, sources, targets, weights, bool(directed))
+
+    csr_weights, offsets, csr_targets = read_array("d", arcs), read_array("i", n + 1), read_array("i", arcs)
+
+    return CSRGraph(n, offsets, csr_targets, csr_weights, bool(directed), m)
+
+
+def text_to_binary_graph(input_path: str,
+                         output_path: str,
+                         directed: bool = True,
+                         weighted: bool = True,
+                         file_format: Optional[GraphFileFormat] = None,
+                         with_csr: bool = True):
+    """
+    Converts a graph file in any of the text formats supported by load_graph_file to the binary graph format.
+    :param input_path: The path of the text file.
+    :param output_path: The path of the binary file.
+    :param directed: Whether the graph is directed or not.
+    :param weighted: Whether the weights of the file are read, if not every edge gets a weight of 1.
+    :param file_format: The format of the text file, by default deduced from its extension.
+    :param with_csr: Whether the CSR index is also stored.
+    """
+    save_binary_graph(load_graph_file(input_path, directed, weighted, file_format), output_path, with_csr)
+
+
+def graph_file_format(path: str) -> GraphFileFormat:
+    """
+    Deduces the format of a graph file from its extension.
+    :param path: The path of the file.
+    :return: The format of the file.
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == ".gr":
+        return GraphFileFormat.DIMACS
+
+    if extension == ".mtx":
+        return GraphFileFormat.MATRIX_MARKET
+
+    return GraphFileFormat.EDGE_LIST
+
+
+def __chunks(buffer: mmap.mmap, start: int) -> Iterator[bytes]:
+    """
+    Splits the memory-mapped buffer in chunks of whole lines, so only one bounded chunk is in memory at a time.
+    :param buffer: The buffer.
+    :param start: The position where the first chunk starts.
+    :return: The chunks of the buffer.
+    """
+    size = len(buffer)
+
+    while start < size:
+        end = buffer.find(b"\n", min(start + GRAPH_FILE_CHUNK_SIZE, size))
+        end = size if end == -1 else end + 1
+
+        yield buffer[start:end]
+        start = end
+
+
+def __append_edges(edge_list: Tuple[array, array, array],
+                   sources: Iterable[bytes],
+                   targets: Iterable[bytes],
+                   weights: Optional[Iterable[bytes]],
+                   first_index: int):
+    """
+    Appends the columns of edges read from a chunk to the parallel arrays of an edge list.
+    :param edge_list: The sources, the targets and the weights of the edge list.
+    :param sources: The sources read.
+    :param targets: The targets read.
+    :param weights: The weights read, if None every edge gets a weight of 1.
+    :param first_index: The index of the first node in the file.
+    """
+    start = len(edge_list[0])
+    sources, targets = map(int, sources), map(int, targets)
+
+    if first_index:
+        sources = map(sub, sources, repeat(first_index))
+        targets = map(sub, targets, repeat(first_index))
+
+    edge_list[0].extend(sources)
+    edge_list[1].extend(targets)
+
+    if weights is None:
+        edge_list[2].extend(array("d", [1.0]) * (len(edge_list[0]) - start))
+    else:
+        edge_list[2].extend(map(float, weights))
+
+
+def __drop_self_loops(edge_list: Tuple[array, array, array]) -> Tuple[array, array, array]:
+    """
+    Removes the self-loops of an edge list, copying it only if it contains any.
+    :param edge_list: The sources, the targets and the weights of the edge list.
+    :return: The edge list without self-loops.
+    """
+    sources, targets, weights = edge_list
+    keep = [u != v for u, v in zip(sources, targets)]
+
+    if all(keep):
+        return edge_list
+
+    return (array("i", compress(sources, keep)),
+            array("i", compress(targets, keep)),
+            array("d", compress(weights, keep)))
+
+
+def __read_edge_list(buffer: mmap.mmap, weighted: bool) -> Tuple[int, Tuple[array, array, array]]:
+    """
+    Reads a graph in the format of the text inputs from a memory-mapped buffer. The numbers of every chunk are
+    parsed at once with NumPy and the file must contain as many edges as its first line declares.
+    :param buffer: The buffer.
+    :param weighted: Whether the graph is weighted or not.
+    :return: The number of nodes and the parallel arrays of the edge list.
+    """
+    header = EDGE_LIST_HEADER.match(buffer)
+
+    if header is None:
+        raise ValueError("The first line must contain two integers specifying the number of nodes and edges")
+
+    n, m = int(header.group(1)), int(header.group(2))
+    edge_list = array("i"), array("i"), array("d")
+    values_per_edge = 3 if weighted else 2
+    edges_read = 0
+
+    for chunk in __chunks(buffer, header.end()):
+        values = __parse_numbers(chunk, m - edges_read)[:(m - edges_read) * values_per_edge]
+
+        if len(values) % values_per_edge != 0:
+            raise ValueError(f"Every edge must contain {values_per_edge} values")
+
+        edges = values.reshape(-1, values_per_edge)
+        endpoints = edges[:, :2].astype(np.intc)
+        edges_read += len(edges)
+
+        if not np.array_equal(endpoints, edges[:, :2]):
+            raise ValueError("The nodes of the edges must be integers")
+
+        # The self-loops are discarded here, so the edge list is never copied again
+        keep = endpoints[:, 0] != endpoints[:, 1]
+        edge_list[0].frombytes(endpoints[keep, 0].tobytes())
+        edge_list[1].frombytes(endpoints[keep, 1].tobytes())
+        edge_list[2].frombytes(edges[keep, 2].tobytes() if weighted else np.ones(np.count_nonzero(keep)).tobytes())
+
+        if edges_read == m:
+            break
+
+    if edges_read != m:
+        raise ValueError(f"The file declares {m} edges, but it contains {edges_read}")
+
+    return n, edge_list
+
+
+def __parse_numbers(chunk: bytes, lines: int) -> np.ndarray:
+    """
+    Parses the numbers separated by whitespace in a chunk with NumPy, without a Python object for every number.
+    If the chunk contains anything else, only its first non-empty lines are parsed, as the lines after the edges
+    are ignored.
+    :param chunk: The chunk of whole lines.
+    :param lines: The number of non-empty lines that are needed from the chunk.
+    :return: The numbers read.
+    """
+    with warnings.catch_warnings():
+        # Older versions of NumPy only warn when the text is not numeric
+        warnings.simplefilter("error", DeprecationWarning)
+
+        try:
+            return np.fromstring(chunk, dtype=np.float64, sep=" ")
+        except (ValueError, DeprecationWarning):
+            pass
+
+        try:
+            needed = [line for line in chunk.split(b"\n") if line.strip()][:lines]
+            return np.fromstring(b"\n".join(needed), dtype=np.float64, sep=" ")
+        except (ValueError, DeprecationWarning):
+            raise ValueError("The edges must only contain numbers") from None
+
+
+def __read_dimacs(buffer: mmap.mmap, weighted: bool) -> Tuple[int, Tuple[array, array, array]]:
+    """
+    Reads a graph in DIMACS shortest path format from a memory-mapped buffer.
+    :param buffer: The buffer.
+    :param weighted: Whether the graph is weighted or not.
+    :return: The number of nodes and the parallel arrays of the edge list.
+    """
+    problem = DIMACS_PROBLEM.search(buffer)
+
+    if problem is None:
+        raise ValueError("The DIMACS file must contain a problem line 'p sp n m'")
+
+    n = int(problem.group(1))
+    edge_list = array("i"), array("i"), array("d")
+
+    for chunk in __chunks(buffer, problem.end()):
+        arcs = DIMACS_ARC.findall(chunk)
+
+        if arcs:
+            sources, targets, weights = zip(*arcs)
+            __append_edges(edge_list, sources, targets, weights if weighted else None, 1)
+
+    return n, __drop_self_loops(edge_list)
+
+
+def __read_matrix_market(buffer: mmap.mmap, weighted: bool) -> Tuple[int, Tuple[array, array, array], bool]:
+    """
+    Reads a graph in coordinate Matrix Market format from a memory-mapped buffer.
+    :param buffer: The buffer.
+    :param weighted: Whether the graph is weighted or not.
+    :return: The number of nodes, the parallel arrays of the edge list and whether the matrix is symmetric.
+    """
+    header = MATRIX_MARKET_HEADER.match(buffer)
+
+    if header is None:
+        raise ValueError("The Matrix Market file must start with the '%%MatrixMarket matrix' header")
+
+    matrix_format, field, symmetry = (group.decode().lower() for group in header.groups())
+
+    if matrix_format != "coordinate":
+        raise ValueError("Only coordinate Matrix Market files are supported")
+
+    if field not in ("real", "integer", "pattern"):
+        raise ValueError(f"Matrix Market field {field} is not supported")
+
+    size = MATRIX_MARKET_SIZE.search(buffer, header.end())
+
+    if size is None:
+        raise ValueError("The Matrix Market file must contain the size line 'rows columns entries'")
+
+    rows, columns = int(size.group(1)), int(size.group(2))
+    weighted = weighted and field != "pattern"
+    edge_list = array("i"), array("i"), array("d")
+
+    for chunk in __chunks(buffer, size.end()):
+        entries = MATRIX_MARKET_ENTRY.findall(chunk)
+
+        if entries:
+            sources, targets, weights = zip(*entries)
+            __append_edges(edge_list, sources, targets, weights if weighted else None, 1)
+
+    return max(rows, columns), __drop_self_loops(edge_list), symmetry != "general"
+
+
+def __compute_fingerprint(graph: Union[ParsedGraph, CSRGraph]) -> str:
+    """
+    Hashes the number of nodes, the directedness and the edges of a graph with BLAKE2b.
+    :param graph: The graph, either parsed or in CSR format, not a parsed graph over a CSR graph.
+    :return: The hexadecimal fingerprint.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(struct.pack("<qq?", graph.n, graph.m, graph.directed))
+
+    if isinstance(graph, CSRGraph):
+        for values in (graph.offsets, graph.targets, graph.weights):
+            digest.update(memoryview(values).cast("B"))
+
+        return digest.hexdigest()
+
+    sources, targets, weights = array("i"), array("i"), array("d")
+
+    for u, v, w in graph.edges:
+        sources.append(u)
+        targets.append(v)
+        weights.append(w)
+
+    for values in (sources, targets, weights):
+        digest.update(values)
+
+    return digest.hexdigest()
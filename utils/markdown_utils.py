@@ -1,4 +1,9 @@
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Callable, Set, Tuple
+
+"""
+A changed cell of a matrix, as a tuple (row, column, value)
+"""
+CellChange = Tuple[int, int, Any]
 
 
 def latex_wrapper(function):
@@ -22,15 +27,21 @@ def latex_to_markdown(latex_string) -> str:
     return f"$$\n{latex_string}\n$$"
 
 
-def matrix_to_markdown(matrix: List[List[float]]) -> str:
+def matrix_to_markdown(matrix: List[List[float]], highlighted: Optional[Set[Tuple[int, int]]] = None) -> str:
     """
     Convert a matrix to Markdown format.
     :param matrix: The matrix to convert.
+    :param highlighted: The cells (row, column) to highlight in bold.
     """
     markdown = "\\begin{pmatrix}\n"
 
-    for row in matrix:
-        markdown += " & ".join([str(x) if x != float('inf') else "\\infty" for x in row]) + "\\\\\n"
+    for i, row in enumerate(matrix):
+        cells = [str(x) if x != float('inf') else "\\infty" for x in row]
+
+        if highlighted:
+            cells = [f"\\mathbf{{{cell}}}" if (i, j) in highlighted else cell for j, cell in enumerate(cells)]
+
+        markdown += " & ".join(cells) + "\\\\\n"
 
     markdown += "\\end{pmatrix}\n"
     return markdown
@@ -55,17 +66,22 @@ def matrix_multiplication_to_markdown(matrix1: List[List[float]],
 
 def markdown_table(data: List[List[Any]],
                    headers_row: Optional[List[str]] = None,
-                   headers_column: Optional[List[str]] = None) -> str:
+                   headers_column: Optional[List[str]] = None,
+                   highlighted: Optional[Set[Tuple[int, int]]] = None) -> str:
     """
     Convert a list of lists to a Markdown table.
     :param data: The data to convert.
     :param headers_row: The headers for the rows.
     :param headers_column: The headers for the columns.
+    :param highlighted: The cells (row, column) of the data to highlight in bold.
     """
 
     if not isinstance(data[0][0], str):
         data = [[str(x) for x in row] for row in data]
 
+    if highlighted:
+        data = [[f"**{x}**" if (i, j) in highlighted else x for j, x in enumerate(row)] for i, row in enumerate(data)]
+
     rows = []
 
     if headers_column:
@@ -83,3 +99,117 @@ def markdown_table(data: List[List[Any]],
             rows[i] = f"| **{headers_column[i - 2]}** {row}"
 
     return "\n".join(rows)
+
+
+class MatrixTrace:
+
+    def __init__(self, matrix: List[List[Any]],
+                 render: Callable[[List[List[Any]], Set[Tuple[int, int]]], str],
+                 name: str = "matrix"):
+        """
+        Trace of a matrix filled step by step. The full matrix is rendered only once, at the start,
+        and every step records only the cells it changes, so the size of the trace is linear
+        in the number of updates instead of a full matrix per step.
+        The full matrix of any step is reconstructed on demand replaying the changes.
+        :param matrix: The initial matrix, it is copied.
+        :param render: Function to render a matrix as Markdown, with the cells (row, column) to highlight
+        passed in the keyword argument highlighted.
+        :param name: Name of the trace, used to identify its steps.
+        """
+        self.initial = [list(row) for row in matrix]
+        self.current = [list(row) for row in matrix]
+        self.render = render
+        self.name = name
+        self.steps: List[List[Tuple[int, int, Any, Any]]] = []
+
+    def snapshot(self) -> str:
+        """
+        Renders the initial matrix.
+        :return: The Markdown of the initial matrix.
+        """
+        return self.render(self.initial, highlighted=set())
+
+    def record(self, changes: List[CellChange]) -> "MatrixDelta":
+        """
+        Records a new step of the trace.
+        :param changes: The cells changed in the step with their new values.
+        :return: The changes of the step, to be rendered.
+        """
+        step = []
+
+        for i, j, value in changes:
+            step.append((i, j, self.current[i][j], value))
+            self.current[i][j] = value
+
+        self.steps.append(step)
+
+        return MatrixDelta(self, len(self.steps) - 1)
+
+    def matrix_at(self, step: int) -> List[List[Any]]:
+        """
+        Reconstructs the matrix after a step.
+        :param step: The index of the step.
+        :return: The matrix after the step.
+        """
+        matrix = [list(row) for row in self.initial]
+
+        for changes in self.steps[:step + 1]:
+            for i, j, _, value in changes:
+                matrix[i][j] = value
+
+        return matrix
+
+
+class MatrixDelta:
+
+    def __init__(self, trace: MatrixTrace, step: int):
+        """
+        Changes of a matrix in a step of a trace.
+        :param trace: The trace of the matrix.
+        :param step: The index of the step in the trace.
+        """
+        self.trace = trace
+        self.step = step
+
+    @property
+    def changes(self) -> List[Tuple[int, int, Any, Any]]:
+        """
+        The cells changed in the step as tuples (row, column, old value, new value).
+        """
+        return self.trace.steps[self.step]
+
+    @property
+    def key(self) -> str:
+        """
+        Unique identifier of the step.
+        """
+        return f"{self.trace.name}-{self.step}"
+
+    def to_markdown(self) -> str:
+        """
+        Renders only the changed cells, with the new values highlighted.
+        :return: The Markdown table of the changes.
+        """
+        if not self.changes:
+            return "No cell has changed."
+
+        rows = [[f"({i}, {j})", cell_to_markdown(old), f"**{cell_to_markdown(new)}**"]
+                for i, j, old, new in self.changes]
+
+        return markdown_table(rows, ["Cell", "Before", "After"])
+
+    def full_table(self) -> str:
+        """
+        Reconstructs and renders the full matrix after the step, with the changed cells highlighted.
+        :return: The Markdown of the full matrix.
+        """
+        highlighted = {(i, j) for i, j, _, _ in self.changes}
+        return self.trace.render(self.trace.matrix_at(self.step), highlighted=highlighted)
+
+
+def cell_to_markdown(value: Any) -> str:
+    """
+    Convert the value of a cell to Markdown.
+    :param value: The value of the cell.
+    """
+    return str(value) if value != float('inf') else "∞"
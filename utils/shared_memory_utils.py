@@ -0,0 +1,89 @@
+from array import array
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Tuple, Sequence
+
+"""
+Layout of the arrays stored in a shared memory block.
+The key is the name of the array and the value is a tuple (typecode, offset in bytes, length)
+"""
+SharedArraysLayout = Dict[str, Tuple[str, int, int]]
+
+SHARED_ARRAY_ALIGNMENT = 8
+
+
+def create_shared_arrays(arrays: Dict[str, Tuple[str, int]]) -> Tuple[SharedMemory, SharedArraysLayout]:
+    """
+    Creates a shared memory block big enough to hold the given arrays, aligned to 8 bytes.
+    :param arrays: The arrays to allocate, the key is the name and the value is a tuple (typecode, length).
+    :return: The shared memory block and the layout of the arrays inside it.
+    """
+    layout = {}
+    offset = 0
+
+    for name, (typecode, length) in arrays.items():
+        layout[name] = (typecode, offset, length)
+        offset += length * array(typecode).itemsize
+        offset += -offset % SHARED_ARRAY_ALIGNMENT
+
+    return SharedMemory(create=True, size=max(offset, 1)), layout
+
+
+def share_arrays(arrays: Dict[str, Sequence]) -> Tuple[SharedMemory, SharedArraysLayout]:
+    """
+    Copies the given arrays to a new shared memory block.
+    :param arrays: The arrays to copy, the key is the name and the value is an array or a memoryview.
+    :return: The shared memory block and the layout of the arrays inside it.
+    """
+    memory, layout = create_shared_arrays({
+        name: (memoryview(values).format, len(values)) for name, values in arrays.items()
+    })
+
+    for name, values in arrays.items():
+        _, offset, _ = layout[name]
+        values = memoryview(values).cast("B")
+        memory.buf[offset:offset + len(values)] = values
+        values.release()
+
+    return memory, layout
+
+
+def shared_arrays(memory: SharedMemory, layout: SharedArraysLayout) -> Dict[str, memoryview]:
+    """
+    Returns typed views over the arrays stored in a shared memory block, without copying them.
+    :param memory: The shared memory block.
+    :param layout: The layout of the arrays inside the block.
+    :return: The views over the arrays by name.
+    """
+    return {
+        name: memory.buf[offset:offset + length * array(typecode).itemsize].cast(typecode)
+        for name, (typecode, offset, length) in layout.items()
+    }
+
+
+def attach_shared_memory(name: str) -> SharedMemory:
+    """
+    Attaches to a shared memory block created by another process, which is the only one that unlinks it.
+    Before Python 3.13 the block can not be left out of the resource tracker, but the worker processes
+    share the tracker of their parent, so registering it again has no effect.
+    :param name: The name of the shared memory block.
+    :return: The shared memory block.
+    """
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:
+        return SharedMemory(name=name)
+
+
+def release_shared_memory(memory: SharedMemory):
+    """
+    Unlinks and closes a shared memory block created by this process. The block is unlinked first, so it does not
+    outlive the process even if a view over it is still alive, for example in the traceback of an exception raised
+    while it was in use. In that case it can not be closed yet and it is unmapped when the last view is released.
+    :param memory: The shared memory block.
+    """
+    memory.unlink()
+
+    try:
+        memory.close()
+    except BufferError:
+        pass
@@ -1,46 +1,46 @@
 from typing import Tuple, Optional
 
 
-def only_one_parameter_positive_number(input_string) -> Tuple[bool, Optional[str]]:
+def only_one_parameter_positive_number(input_string) -> Tuple[bool, Optional[str], Optional[str]]:
     """
     Checks if the input string has only one parameter
     :param input_string: The input string
-    :return: True if the input string has only one parameter, False otherwise
+    :return: True if the input string has only one parameter, False otherwise, together with a message and the input
     """
     lines = input_string.splitlines()
     if len(lines) != 1:
-        return False, "The input string must contain only one line"
+        return False, "The input string must contain only one line", None
 
     line = lines[0]
     line = line.split()
 
     if len(line) != 1:
-        return False, "The input string must contain only one parameter"
+        return False, "The input string must contain only one parameter", None
 
     try:
         n = int(line[0])
     except ValueError:
-        return False, "The input string must contain only one integer parameter"
+        return False, "The input string must contain only one integer parameter", None
 
     if n <= 0:
-        return False, "The input string must contain only one positive integer parameter"
+        return False, "The input string must contain only one positive integer parameter", None
 
-    return True, None
+    return True, None, input_string
 
 
-def two_strings(input_string) -> Tuple[bool, Optional[str]]:
+def two_strings(input_string) -> Tuple[bool, Optional[str], Optional[str]]:
     """
     Checks if the input string has two strings
     :param input_string: The input string
-    :return: True if the input string has two strings, False otherwise
+    :return: True if the input string has two strings, False otherwise, together with a message and the input
     """
     lines = input_string.splitlines()
     if len(lines) != 2:
-        return False, "The input string must contain two lines"
+        return False, "The input string must contain two lines", None
 
     for line in lines:
         line = line.split()
         if len(line) != 1:
-            return False, "The input string must contain two strings"
+            return False, "The input string must contain two strings", None
 
-    return True, None
+    return True, None, input_string
@@ -1,10 +1,12 @@
 from queue import Queue
-from typing import Tuple, Optional
+from typing import Tuple, Optional, List
 
-from utils.graph_utils import input_to_adjacency_list
+from utils.graph_utils import ParsedGraph, edges_to_parsed_graph
 
 
-def validate_graph(input_graph: str, weighted=True) -> Tuple[bool, Optional[str]]:
+def validate_graph(input_graph: str,
+                   weighted: bool = True,
+                   directed: bool = True) -> Tuple[bool, Optional[str], Optional[ParsedGraph]]:
     """
     Validates the input graph
 
@@ -20,81 +22,99 @@ def validate_graph(input_graph: str, weighted=True) -> Tuple[bool, Optional[str]
     2 5 6
     :param input_graph: The input graph
     :param weighted: Whether the graph is weighted or not
+    :param directed: Whether the graph is directed or not
 
-    :return: A tuple with a boolean and a message. If the boolean is True, the graph is valid.
-    If the boolean is False, then the graph is not valid and the message contains the reason.
+    :return: A tuple with a boolean, a message and the parsed graph. If the boolean is True, the graph is valid and
+    the parsed graph is returned. If the boolean is False, then the graph is not valid and the message contains the reason.
     """
-    lines = input_graph.splitlines()
+    return __validate_graph_lines(input_graph.splitlines(), weighted, directed)
+
 
+def __validate_graph_lines(lines: List[str],
+                           weighted: bool,
+                           directed: bool) -> Tuple[bool, Optional[str], Optional[ParsedGraph]]:
+    """
+    Validates the lines of the input graph, parsing the edges in the same pass
+    :param lines: The lines of the input graph
+    :param weighted: Whether the graph is weighted or not
+    :param directed: Whether the graph is directed or not
+
+    :return: A tuple with a boolean, a message and the parsed graph as in validate_graph
+    """
     if len(lines) == 0:
-        return False, "The input graph cannot be empty"
+        return False, "The input graph cannot be empty", None
 
     if len(lines[0].split()) != 2:
-        return False, "The first line must contain two integers specifying the number of nodes and edges"
+        return False, "The first line must contain two integers specifying the number of nodes and edges", None
 
     n, m = lines[0].split()
 
     if not n.isdigit() or not m.isdigit():
-        return False, "The first line must contain two integers specifying the number of nodes and edges"
+        return False, "The first line must contain two integers specifying the number of nodes and edges", None
 
     n, m = int(n), int(m)
     if n < 1 or m < 0:
-        return False, "The number of nodes must be at least 1 and the number of edges must be at least 0"
+        return False, "The number of nodes must be at least 1 and the number of edges must be at least 0", None
 
     lines = lines[1:]
 
     if len(lines) != m:
-        return False, "The number of edges does not match the number of defined edges"
+        return False, "The number of edges does not match the number of defined edges", None
+
+    edges = []
 
     for line in lines:
+        values = line.split()
 
         if weighted:
-            if len(line.split()) != 3:
-                return False, f"The line {line} does not contain three values specifying the edge"
+            if len(values) != 3:
+                return False, f"The line {line} does not contain three values specifying the edge", None
 
-            u, v, w = line.split()
+            u, v, w = values
             if not u.isdigit() or not v.isdigit() or not w.isdigit():
-                return False, f"The line {line} does not contain three integers specifying the edge"
+                return False, f"The line {line} does not contain three integers specifying the edge", None
 
             if int(w) <= 0:
-                return False, f"The weight of the edge {line} must be positive"
+                return False, f"The weight of the edge {line} must be positive", None
 
         else:
-            if len(line.split()) != 2:
-                return False, f"The line {line} does not contain two values specifying the edge"
+            if len(values) != 2:
+                return False, f"The line {line} does not contain two values specifying the edge", None
 
-            u, v = line.split()
+            u, v = values
             if not u.isdigit() or not v.isdigit():
-                return False, f"The line {line} does not contain two integers specifying the edge"
+                return False, f"The line {line} does not contain two integers specifying the edge", None
 
         u, v = int(u), int(v)
 
         if u == v:
-            return False, f"The line {line} contains a edge from a node to itself"
+            return False, f"The line {line} contains a edge from a node to itself", None
 
         if u < 0 or u >= n or v < 0 or v >= n:
-            return False, f"The line {line} contains an invalid node"
+            return False, f"The line {line} contains an invalid node", None
 
-    return True, None
+        edges.append((u, v, float(w)) if weighted else (u, v))
+
+    return True, None, edges_to_parsed_graph(n, edges, directed, weighted)
 
 
-def validate_only_one_component(input_graph: str, directed: bool, weighted: bool) -> Tuple[bool, Optional[str]]:
+def validate_only_one_component(input_graph: str,
+                                directed: bool,
+                                weighted: bool) -> Tuple[bool, Optional[str], Optional[ParsedGraph]]:
     """
     First, validates the input graph. If the input graph is valid, it checks if the graph is connected.
 
     :param input_graph: The input graph
     :param directed: Whether the graph is directed or not
     :param weighted: Whether the graph is weighted or not
-    :return: A tuple with a boolean and a message. If the boolean is True, the graph is valid.
+    :return: A tuple with a boolean, a message and the parsed graph. If the boolean is True, the graph is valid.
     If the boolean is False, then the graph is not valid and the message contains the reason.
     """
 
-    is_a_valid_graph, message = validate_graph(input_graph, weighted)
+    is_a_valid_graph, message, graph = validate_graph(input_graph, weighted, directed)
 
     if not is_a_valid_graph:
-        return False, message
-
-    graph = input_to_adjacency_list(input_graph, directed, weighted)
+        return False, message, None
 
     visited = [False] * len(graph)
     queue = Queue()
@@ -109,9 +129,9 @@ def validate_only_one_component(input_graph: str, directed: bool, weighted: bool
                 queue.put(neighbour)
 
     if all(visited):
-        return True, None
+        return True, None, graph
     else:
-        return False, "The graph must only have one connected component"
+        return False, "The graph must only have one connected component", None
 
 
 def validate_number_of_edges(n: int, m: int) -> Tuple[bool, Optional[str]]:
@@ -131,9 +151,12 @@ def validate_number_of_edges(n: int, m: int) -> Tuple[bool, Optional[str]]:
     return True, None
 
 
-def validate_graph_with_source_vertex(input_graph: str, weighted=True) -> Tuple[bool, Optional[str]]:
+def validate_graph_with_source_vertex(input_graph: str,
+                                      weighted: bool = True,
+                                      directed: bool = True) -> Tuple[bool, Optional[str], Optional[ParsedGraph]]:
     """
-    Validates the input graph. It must have a source vertex in the last line.
+    Validates the input graph. It must have a source vertex in the line after the edges,
+    optionally followed by a line with a target vertex.
 
     Example input:
     6 8
@@ -146,25 +169,45 @@ def validate_graph_with_source_vertex(input_graph: str, weighted=True) -> Tuple[
     2 4 5
     2 5 6
     0
+    5
     :param input_graph: The input graph
     :param weighted: Whether the graph is weighted or not
+    :param directed: Whether the graph is directed or not
 
-    :return: A tuple with a boolean and a message. If the boolean is True, the graph is valid.
-    If the boolean is False, then the graph is not valid and the message contains the reason.
+    :return: A tuple with a boolean, a message and the parsed graph with its source and target vertices.
+    If the boolean is True, the graph is valid. If the boolean is False, then the graph is not valid
+    and the message contains the reason.
     """
-    valid, message = validate_graph(input_graph[:-1], weighted)
+    lines = input_graph.splitlines()
+
+    if len(lines) == 0:
+        return False, "The input graph cannot be empty", None
+
+    header = lines[0].split()
+    number_of_vertex_lines = 1
+
+    if len(header) == 2 and header[1].isdigit() and len(lines) == int(header[1]) + 3:
+        number_of_vertex_lines = 2
+
+    valid, message, graph = __validate_graph_lines(lines[:-number_of_vertex_lines], weighted, directed)
     if not valid:
-        return False, message
+        return False, message, None
 
-    lines = input_graph.splitlines()
-    source_vertex = lines[-1]
+    vertices = []
 
-    if not source_vertex.isdigit():
-        return False, "The source vertex must be an integer"
+    for (name, vertex) in zip(("source", "target"), lines[-number_of_vertex_lines:]):
+        vertex = vertex.strip()
 
-    source_vertex = int(source_vertex)
-    n = int(lines[0].split()[0])
-    if not 0 <= source_vertex < n:
-        return False, "The source vertex must be a valid node"
+        if not vertex.isdigit():
+            return False, f"The {name} vertex must be an integer", None
 
-    return True, None
+        vertex = int(vertex)
+        if not 0 <= vertex < graph.n:
+            return False, f"The {name} vertex must be a valid node", None
+
+        vertices.append(vertex)
+
+    graph.source = vertices[0]
+    graph.target = vertices[1] if len(vertices) > 1 else None
+
+    return True, None, graph